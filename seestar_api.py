@@ -8,46 +8,198 @@ Handles HTTP requests, retries, and error handling
 import requests
 import time
 import json
+import random
 import logging
-from typing import Optional, Dict, Any
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, Any, Hashable, List, Tuple, Union
+from urllib.parse import urlencode
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+def _dumps(value: Any) -> str:
+    """JSON-encode command parameters, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+# Keep-alive connections pooled per host: monitor poll workers, batch
+# workers and concurrent user commands all share them
+_POOL_MAXSIZE = 16
+# Batch workers take half the pool, leaving the rest for polls and commands
+_BATCH_WORKERS = _POOL_MAXSIZE // 2
+
+# Renamed from BACKOFF_MAX to DEFAULT_BACKOFF_MAX in urllib3 2.x
+BACKOFF_MAX = getattr(Retry, "DEFAULT_BACKOFF_MAX", getattr(Retry, "BACKOFF_MAX", 120))
+
+class JitteredRetry(Retry):
+    """Retry policy adding random jitter so clients don't retry in lockstep"""
+    
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return min(BACKOFF_MAX, backoff + random.uniform(0, self.backoff_factor))
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTP adapter whose pooled sockets disable Nagle and probe idle peers"""
+    
+    socket_options = HTTPConnection.default_socket_options + [  # includes TCP_NODELAY
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+def _freeze(value: Any) -> Hashable:
+    """Convert nested parameters into a hashable cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+@lru_cache(maxsize=64)
+def _encode_payload(action: str, params_json: str) -> bytes:
+    """Form-encode a request payload up to its transaction id"""
+    encoded = urlencode({
+        "Action": action,
+        "Parameters": params_json,
+        "ClientID": "1"
+    })
+    return f"{encoded}&ClientTransactionID=".encode()
+
+# Commands whose parameters never change, pre-encoded at import
+_FIXED_COMMANDS = [
+    ("method_sync", {"method": "scope_get_equ_coord"}),
+    ("method_sync", {"method": "get_view_state"}),
+    ("method_sync", {"method": "get_device_state"}),
+    ("method_sync", {"method": "iscope_stop_view", "params": {"stage": "AutoGoto"}}),
+    ("method_sync", {"method": "stop_exposure"}),
+    ("method_sync", {"method": "start_auto_focuse"})
+]
+_FIXED_PAYLOADS: Dict[Tuple, bytes] = {
+    (action, _freeze(params)): _encode_payload(action, _dumps(params))
+    for action, params in _FIXED_COMMANDS
+}
+
+# Marker for cache misses, since failed requests are cached as None
+_MISS = object()
+
+# Cache keys for the mount state outdated by slew and sync commands
+_COORD_KEY = ("method_sync", _freeze({"method": "scope_get_equ_coord"}))
+_VIEW_STATE_KEY = ("method_sync", _freeze({"method": "get_view_state"}))
+_DEVICE_STATE_KEY = ("method_sync", _freeze({"method": "get_device_state"}))
+
 class SeestarAPI:
-    def __init__(self, host: str = "localhost", port: int = 5555, device_num: int = 1):
+    def __init__(self,
+                 host: str = "localhost",
+                 port: int = 5555,
+                 device_num: int = 1,
+                 cache_timeout: float = 0.5):
         self.logger = logging.getLogger("SeestarAPI")
         self.base_url = f"http://{host}:{port}/api/v1/telescope/{device_num}/action"
         
         # Default headers
         self.headers = {
             "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Connection": "keep-alive"
         }
         
         # Configure session with retries
         self.session = requests.Session()
-        retries = Retry(
+        retries = JitteredRetry(
             total=3,  # Number of retries
-            backoff_factor=0.5,  # Wait 0.5, 1, 2 seconds between retries
-            status_forcelist=[500, 502, 503, 504]  # HTTP status codes to retry on
+            connect=3,
+            read=3,
+            backoff_factor=0.5,  # Wait 0.5, 1, 2 seconds (plus jitter) between retries
+            status_forcelist=(429, 500, 502, 503, 504),  # HTTP status codes to retry on
+            allowed_methods=frozenset(["GET", "PUT", "POST"]),  # All commands are sent as PUT
+            respect_retry_after_header=True,
+            raise_on_status=False  # Let raise_for_status report the final response
+        )
+        adapter = KeepAliveAdapter(
+            pool_connections=4,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=retries,
+            pool_block=False
         )
-        self.session.mount('http://', HTTPAdapter(max_retries=retries))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Workers for send_batch, created on first use
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        self._batch_lock = threading.Lock()
+        
+        # Response cache, replaced wholesale on writes so reads need no lock
+        self._snapshot: Dict[Tuple, Tuple[Any, float]] = {}  # key -> (value, expiry)
+        self._cache_lock = threading.Lock()
+        self._cache_timeout = cache_timeout  # seconds, for endpoints without their own TTL
+        self._negative_cache_timeout = 1.0  # seconds, for failed requests
+        self._cache_max_entries = 256
+        
+        # Cache TTLs by (action, method), matched to how fast each value changes
+        self._ttl_by_endpoint: Dict[Tuple[str, Optional[str]], float] = {
+            ("method_sync", "scope_get_equ_coord"): 0.2,
+            ("method_sync", "get_view_state"): 0.25,
+            ("method_sync", "get_device_state"): 5.0
+        }
         
-        # Response cache
-        self._cache: Dict[str, Any] = {}
-        self._cache_timeout = 0.5  # seconds
-        self._last_cache_time: Dict[str, float] = {}
+    def _get_cached(self, cache_key: Tuple) -> Any:
+        """Get cached value if still valid, otherwise _MISS"""
+        entry = self._snapshot.get(cache_key)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return _MISS
         
-    def _is_cache_valid(self, cache_key: str) -> bool:
+    def _is_cache_valid(self, cache_key: Tuple) -> bool:
         """Check if cached value is still valid"""
-        if cache_key not in self._last_cache_time:
-            return False
-        return time.time() - self._last_cache_time[cache_key] < self._cache_timeout
+        return self._get_cached(cache_key) is not _MISS
         
-    def _update_cache(self, cache_key: str, value: Any):
+    def _update_cache(self, cache_key: Tuple, value: Any, ttl: float):
         """Update cache with new value"""
-        self._cache[cache_key] = value
-        self._last_cache_time[cache_key] = time.time()
+        with self._cache_lock:
+            now = time.monotonic()
+            snapshot = dict(self._snapshot)
+            snapshot.pop(cache_key, None)
+            
+            # Keep the cache bounded: drop expired entries first, then the oldest
+            if len(snapshot) >= self._cache_max_entries:
+                snapshot = {k: v for k, v in snapshot.items() if v[1] > now}
+                while len(snapshot) >= self._cache_max_entries:
+                    del snapshot[next(iter(snapshot))]
+                    
+            snapshot[cache_key] = (value, now + ttl)
+            self._snapshot = snapshot
+        
+    def _invalidate_cache(self, *cache_keys: Tuple):
+        """Drop cached values outdated by a command"""
+        with self._cache_lock:
+            snapshot = dict(self._snapshot)
+            for cache_key in cache_keys:
+                snapshot.pop(cache_key, None)
+            self._snapshot = snapshot
+        
+    def _invalidate_status(self):
+        """Drop all cached status after a command that changes device state"""
+        self._invalidate_cache(_COORD_KEY, _VIEW_STATE_KEY, _DEVICE_STATE_KEY)
+        
+    def close(self):
+        """Release pooled connections"""
+        if self._batch_executor:
+            self._batch_executor.shutdown(wait=False)
+            self._batch_executor = None
+        self.session.close()
         
     def send_command(self, 
                      action: str, 
@@ -66,20 +218,20 @@ class SeestarAPI:
         Returns:
             API response as dictionary or None if request failed
         """
-        cache_key = f"{action}:{json.dumps(parameters, sort_keys=True)}"
+        cache_key = (action, _freeze(parameters))
         
         # Check cache if enabled
-        if use_cache and self._is_cache_valid(cache_key):
-            self.logger.debug(f"Using cached response for {action}")
-            return self._cache[cache_key]
-            
-        # Prepare request payload
-        payload = {
-            "Action": action,
-            "Parameters": json.dumps(parameters),
-            "ClientID": "1",
-            "ClientTransactionID": str(int(time.time()))
-        }
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not _MISS:
+                self.logger.debug("Using cached response for %s", action)
+                return cached
+            
+        # Prepare form-encoded payload, skipping JSON encoding for fixed commands
+        prefix = _FIXED_PAYLOADS.get(cache_key)
+        if prefix is None:
+            prefix = _encode_payload(action, _dumps(parameters))
+        payload = prefix + str(time.time_ns() // 10**9).encode()
         
         try:
             # Send request with timeout
@@ -98,22 +250,62 @@ class SeestarAPI:
             
             # Update cache
             if use_cache:
-                self._update_cache(cache_key, result)
+                ttl = self._ttl_by_endpoint.get(
+                    (action, parameters.get("method")),
+                    self._cache_timeout
+                )
+                self._update_cache(cache_key, result, ttl)
                 
             return result
             
         except requests.exceptions.Timeout:
             self.logger.error(f"Request timed out for action {action}")
-            return None
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Request failed for action {action}: {str(e)}")
-            return None
             
         except json.JSONDecodeError:
             self.logger.error(f"Failed to parse response for action {action}")
-            return None
             
+        # Remember the failure briefly so pollers don't hammer an unreachable telescope
+        if use_cache:
+            self._update_cache(cache_key, None, self._negative_cache_timeout)
+        return None
+            
+    def send_batch(self,
+                   calls: List[Tuple[str, Dict[str, Any]]],
+                   timeout: float = 10.0) -> List[Optional[Dict[str, Any]]]:
+        """
+        Send several commands at once
+        
+        The telescope API has no batch request, so the commands are sent
+        concurrently over the pooled keep-alive connections and the batch
+        costs about one round-trip instead of one per command.
+        
+        Args:
+            calls: (action, parameters) pairs
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Responses in the order of calls, None for failed requests
+        """
+        if len(calls) < 2:
+            return [self.send_command(action, params, timeout=timeout) for action, params in calls]
+            
+        with self._batch_lock:
+            if self._batch_executor is None:
+                self._batch_executor = ThreadPoolExecutor(
+                    max_workers=_BATCH_WORKERS,
+                    thread_name_prefix="SeestarBatch"
+                )
+            executor = self._batch_executor
+            
+        futures = [
+            executor.submit(self.send_command, action, params, timeout=timeout)
+            for action, params in calls
+        ]
+        return [future.result() for future in futures]
+        
     def get_coordinates(self) -> Optional[Dict[str, float]]:
         """Get current telescope coordinates"""
         response = self.send_command(
@@ -126,28 +318,35 @@ class SeestarAPI:
             return response['Value']['result']
         return None
         
-    def goto_target(self, ra: str, dec: str, target_name: str = "Target") -> bool:
+    def goto_target(self,
+                    ra: Union[str, float],
+                    dec: Union[str, float],
+                    target_name: str = "Target") -> bool:
         """
         Slew telescope to target coordinates
         
         Args:
-            ra: Right ascension in HH:MM:SS format
-            dec: Declination in DD:MM:SS format
+            ra: Right ascension in HH:MM:SS format or hours
+            dec: Declination in DD:MM:SS format or degrees
             target_name: Name for the target
             
         Returns:
             True if command was sent successfully
         """
+        # The telescope takes coordinates as strings; convert numbers only here
         response = self.send_command(
             "goto_target",
             {
                 "target_name": target_name,
-                "ra": ra,
-                "dec": dec,
+                "ra": ra if isinstance(ra, str) else str(ra),
+                "dec": dec if isinstance(dec, str) else str(dec),
                 "is_j2000": False
             }
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
         
     def sync_position(self, ra: float, dec: float) -> bool:
         """
@@ -167,7 +366,10 @@ class SeestarAPI:
                 "params": [ra, dec]
             }
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
         
     def stop_slew(self) -> bool:
         """Stop current slew operation"""
@@ -178,7 +380,10 @@ class SeestarAPI:
                 "params": {"stage": "AutoGoto"}
             }
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
         
     def is_slewing(self) -> bool:
         """Check if telescope is currently slewing"""
@@ -192,16 +397,53 @@ class SeestarAPI:
             return response['Value']['result']['View']['stage'] == 'AutoGoto'
         return False
         
-    def get_temperature(self) -> Optional[float]:
-        """Get current temperature"""
+    def get_full_state(self, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get device state with a single request
+        
+        Coordinates and view state included in a fresh response are also
+        cached for get_coordinates and is_slewing, so callers reading
+        several values pay one round-trip instead of one each.
+        
+        Args:
+            use_cache: Whether a cached state may be returned
+            
+        Returns:
+            Device state dictionary or None if request failed
+        """
+        if not use_cache:
+            self._invalidate_cache(_DEVICE_STATE_KEY)
+        fresh = not self._is_cache_valid(_DEVICE_STATE_KEY)
         response = self.send_command(
             "method_sync",
             {"method": "get_device_state"},
             use_cache=True
         )
         
-        if response and 'Value' in response:
-            return response['Value']['result'].get('temperature')
+        if not response or 'Value' not in response:
+            return None
+            
+        result = response['Value']['result']
+        if fresh:
+            if 'ra' in result and 'dec' in result:
+                self._update_cache(
+                    _COORD_KEY,
+                    {"Value": {"result": {"ra": result['ra'], "dec": result['dec']}}},
+                    self._ttl_by_endpoint[("method_sync", "scope_get_equ_coord")]
+                )
+            if 'View' in result:
+                self._update_cache(
+                    _VIEW_STATE_KEY,
+                    {"Value": {"result": {"View": result['View']}}},
+                    self._ttl_by_endpoint[("method_sync", "get_view_state")]
+                )
+        return result
+        
+    def get_temperature(self) -> Optional[float]:
+        """Get current temperature"""
+        state = self.get_full_state()
+        if state is not None:
+            return state.get('temperature')
         return None
         
     def start_exposure(self, duration: float, gain: int = 1) -> bool:
@@ -216,7 +458,10 @@ class SeestarAPI:
                 }
             }
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
         
     def abort_exposure(self) -> bool:
         """Abort current exposure"""
@@ -224,7 +469,10 @@ class SeestarAPI:
             "method_sync",
             {"method": "stop_exposure"}
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
         
     def start_autofocus(self) -> bool:
         """Start auto focus sequence"""
@@ -232,7 +480,10 @@ class SeestarAPI:
             "method_sync",
             {"method": "start_auto_focuse"}  # Note: API spelling
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
         
     def move_filter(self, position: int) -> bool:
         """Move filter wheel to position"""
@@ -243,4 +494,7 @@ class SeestarAPI:
                 "params": {"stack_lenhance": bool(position)}  # Maps filter position to LP filter
             }
         )
-        return response is not None
+        if response is None:
+            return False
+        self._invalidate_status()
+        return True
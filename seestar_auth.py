@@ -5,26 +5,58 @@ Authentication and security module for Seestar INDI driver
 """
 
 import os
-import jwt
+import base64
+import hashlib
+import hmac
+import json
 import bcrypt
 import secrets
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Optional, Dict, Callable
+from typing import Optional, Dict, Callable, Tuple
 from flask import request, jsonify, current_app
 from seestar_config import config_manager
 from seestar_logging import get_logger
 
 logger = get_logger("SeestarAuth")
 
+def _b64encode(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWT requires"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64decode(data: bytes) -> bytes:
+    """Decode unpadded base64url"""
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+# Tokens are always HS256, so the encoded JWT header never changes
+_JWT_HEADER_B64 = _b64encode(b'{"alg":"HS256","typ":"JWT"}')
+_TOKEN_LIFETIME = 24 * 60 * 60  # seconds
+
+def _hash_password(password: str) -> bytes:
+    """Hash password with a fresh bcrypt salt"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+
 class AuthManager:
     """Authentication manager"""
     
     def __init__(self):
-        self.users: Dict[str, str] = {}  # username -> hashed_password
-        self.tokens: Dict[str, str] = {}  # token -> username
-        self.rate_limits: Dict[str, list] = {}  # ip -> [timestamps]
+        self.users: Dict[str, bytes] = {}  # username -> bcrypt hash
+        self.rate_limits: Dict[str, Tuple[float, float]] = {}  # ip -> (tokens, last_refill)
+        self._rate_lock = threading.Lock()
+        self._last_prune = time.monotonic()
+        self._verify_cache: OrderedDict[Tuple[str, bytes], float] = OrderedDict()
+        self._verify_ttl = 30.0  # seconds
+        self._verify_cache_size = 1024
+        self._verify_lock = threading.Lock()
+        self._token_cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()  # token -> (username, exp)
+        self._token_cache_size = 1024
+        self._token_lock = threading.Lock()
         self.secret_key = os.environ.get('SEESTAR_SECRET_KEY', secrets.token_hex(32))
+        self._secret_key_bytes = self.secret_key.encode()
         
         # Load users from config
         self._load_users()
@@ -32,66 +64,132 @@ class AuthManager:
     def _load_users(self):
         """Load users from configuration"""
         if hasattr(config_manager.config, 'auth'):
-            for username, password in config_manager.config.auth.users.items():
-                self.add_user(username, password)
+            users = config_manager.config.auth.users
+            
+            # bcrypt releases the GIL, so hash all users in parallel
+            with ThreadPoolExecutor(thread_name_prefix="SeestarAuth") as executor:
+                hashes = executor.map(_hash_password, users.values())
+                self.users.update(zip(users.keys(), hashes))
                 
     def add_user(self, username: str, password: str):
         """Add or update user"""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode(), salt)
-        self.users[username] = hashed.decode()
+        self.users[username] = _hash_password(password)
+        
+        # Forget verifications made against the previous password
+        with self._verify_lock:
+            for key in [key for key in self._verify_cache if key[0] == username]:
+                del self._verify_cache[key]
         
     def verify_password(self, username: str, password: str) -> bool:
         """Verify password for user"""
         if username not in self.users:
             return False
-        return bcrypt.checkpw(
-            password.encode(),
-            self.users[username].encode()
-        )
+            
+        # Skip bcrypt for credentials verified within the TTL
+        password_bytes = password.encode()
+        key = (username, hashlib.sha256(password_bytes).digest())
+        with self._verify_lock:
+            verified_at = self._verify_cache.get(key)
+            if verified_at is not None and time.monotonic() - verified_at < self._verify_ttl:
+                # Keep recently used credentials from being evicted first
+                self._verify_cache.move_to_end(key)
+                return True
+            
+        if not bcrypt.checkpw(password_bytes, self.users[username]):
+            return False
+            
+        with self._verify_lock:
+            self._verify_cache[key] = time.monotonic()
+            self._verify_cache.move_to_end(key)
+            if len(self._verify_cache) > self._verify_cache_size:
+                self._verify_cache.popitem(last=False)
+        return True
+        
+    def _sign(self, signing_input: bytes) -> bytes:
+        """Compute the HS256 signature for a token"""
+        return hmac.new(self._secret_key_bytes, signing_input, hashlib.sha256).digest()
         
     def generate_token(self, username: str) -> str:
         """Generate JWT token"""
-        payload = {
-            'username': username,
-            'exp': datetime.utcnow() + timedelta(days=1)
-        }
-        token = jwt.encode(payload, self.secret_key, algorithm='HS256')
-        self.tokens[token] = username
-        return token
+        payload = json.dumps(
+            {'username': username, 'exp': int(time.time()) + _TOKEN_LIFETIME},
+            separators=(',', ':')
+        ).encode()
+        signing_input = _JWT_HEADER_B64 + b"." + _b64encode(payload)
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
         
     def verify_token(self, token: str) -> Optional[str]:
         """Verify JWT token and return username"""
+        # Tokens already verified are trusted until they expire
+        with self._token_lock:
+            cached = self._token_cache.get(token)
+            if cached is not None:
+                username, exp = cached
+                if exp > time.time():
+                    # Keep tokens in use from being evicted first
+                    self._token_cache.move_to_end(token)
+                    return username
+                del self._token_cache[token]
+                
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
-            return payload['username']
-        except jwt.ExpiredSignatureError:
-            logger.warning("Expired token")
-            return None
-        except jwt.InvalidTokenError:
+            # Only accept tokens carrying our own HS256 header
+            header, payload_b64, signature = token.encode().split(b".")
+            if header != _JWT_HEADER_B64:
+                raise ValueError("unexpected token header")
+            if not hmac.compare_digest(_b64decode(signature), self._sign(header + b"." + payload_b64)):
+                raise ValueError("bad token signature")
+                
+            payload = json.loads(_b64decode(payload_b64))
+            username = payload['username']
+            exp = payload['exp']
+            # Compared here so a non-numeric exp is an invalid token
+            expired = exp <= time.time()
+        except (ValueError, KeyError, TypeError):
             logger.warning("Invalid token")
             return None
             
-    def check_rate_limit(self, ip: str, limit: int = 100, window: int = 60) -> bool:
-        """Check rate limit for IP"""
-        now = datetime.now()
-        if ip not in self.rate_limits:
-            self.rate_limits[ip] = []
+        if expired:
+            logger.warning("Expired token")
+            return None
+            
+        with self._token_lock:
+            self._token_cache[token] = (username, exp)
+            if len(self._token_cache) > self._token_cache_size:
+                self._token_cache.popitem(last=False)
+        return username
             
-        # Remove old timestamps
-        self.rate_limits[ip] = [
-            ts for ts in self.rate_limits[ip]
-            if (now - ts).total_seconds() < window
-        ]
+    def check_rate_limit(self, ip: str, limit: int = 100, window: int = 60) -> bool:
+        """Check rate limit for IP using a token bucket"""
+        now = time.monotonic()
+        refill_rate = limit / window
         
-        # Check limit
-        if len(self.rate_limits[ip]) >= limit:
-            logger.warning(f"Rate limit exceeded for {ip}")
-            return False
+        with self._rate_lock:
+            # Refill tokens for the time elapsed since the last request
+            tokens, last = self.rate_limits.get(ip, (limit, now))
+            tokens = min(limit, tokens + (now - last) * refill_rate)
             
-        # Add new timestamp
-        self.rate_limits[ip].append(now)
-        return True
+            # Drop idle buckets once per window to bound memory
+            if now - self._last_prune >= window:
+                self._prune_rate_limits(now, limit, refill_rate)
+                
+            # Check limit
+            if tokens < 1:
+                self.rate_limits[ip] = (tokens, now)
+                logger.warning(f"Rate limit exceeded for {ip}")
+                return False
+                
+            # Consume a token
+            self.rate_limits[ip] = (tokens - 1, now)
+            return True
+            
+    def _prune_rate_limits(self, now: float, limit: int, refill_rate: float):
+        """Remove buckets that have refilled completely"""
+        self.rate_limits = {
+            ip: (tokens, last)
+            for ip, (tokens, last) in self.rate_limits.items()
+            if tokens + (now - last) * refill_rate < limit
+        }
+        self._last_prune = now
 
 # Global auth manager instance
 auth_manager = AuthManager()
@@ -125,33 +223,49 @@ def init_ssl():
     
     # Generate self-signed certificate if needed
     if not (os.path.exists(cert_file) and os.path.exists(key_file)):
-        from OpenSSL import crypto
-        
-        # Create key
-        k = crypto.PKey()
-        k.generate_key(crypto.TYPE_RSA, 2048)
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
+        from cryptography.x509.oid import NameOID
         
+        # Create key; EC keys generate much faster than RSA
+        key_type = os.environ.get('SEESTAR_SSL_KEY_TYPE', 'rsa').lower()
+        if key_type == 'ec':
+            k = ec.generate_private_key(ec.SECP256R1())
+        else:
+            k = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            
         # Create certificate
-        cert = crypto.X509()
-        cert.get_subject().C = "US"
-        cert.get_subject().ST = "State"
-        cert.get_subject().L = "City"
-        cert.get_subject().O = "Organization"
-        cert.get_subject().OU = "Organizational Unit"
-        cert.get_subject().CN = "localhost"
-        cert.set_serial_number(1000)
-        cert.gmtime_adj_notBefore(0)
-        cert.gmtime_adj_notAfter(365*24*60*60)  # Valid for one year
-        cert.set_issuer(cert.get_subject())
-        cert.set_pubkey(k)
-        cert.sign(k, 'sha256')
+        subject = x509.Name([
+            x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
+            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "State"),
+            x509.NameAttribute(NameOID.LOCALITY_NAME, "City"),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Organization"),
+            x509.NameAttribute(NameOID.ORGANIZATIONAL_UNIT_NAME, "Organizational Unit"),
+            x509.NameAttribute(NameOID.COMMON_NAME, "localhost")
+        ])
+        now = datetime.now(timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(subject)
+            .public_key(k.public_key())
+            .serial_number(1000)
+            .not_valid_before(now)
+            .not_valid_after(now + timedelta(days=365))  # Valid for one year
+            .sign(k, hashes.SHA256())
+        )
         
         # Save certificate and key
         os.makedirs(cert_path, exist_ok=True)
         with open(cert_file, "wb") as f:
-            f.write(crypto.dump_certificate(crypto.FILETYPE_PEM, cert))
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
         with open(key_file, "wb") as f:
-            f.write(crypto.dump_privatekey(crypto.FILETYPE_PEM, k))
+            f.write(k.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption()
+            ))
             
         logger.info(f"Generated self-signed certificate in {cert_path}")
         
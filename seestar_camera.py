@@ -11,6 +11,70 @@ from threading import Lock
 from seestar_api import SeestarAPI
 from seestar_monitor import DeviceMonitor
 
+# Static property definitions, built into fresh PyIndi objects per device
+# since properties carry per-device state
+_CONNECTION_SWITCHES = (
+    ("CONNECT", "Connect", PyIndi.ISS_OFF),
+    ("DISCONNECT", "Disconnect", PyIndi.ISS_ON)
+)
+_FRAME_TYPE_SWITCHES = (
+    ("FRAME_LIGHT", "Light", PyIndi.ISS_ON),
+    ("FRAME_BIAS", "Bias", PyIndi.ISS_OFF),
+    ("FRAME_DARK", "Dark", PyIndi.ISS_OFF),
+    ("FRAME_FLAT", "Flat", PyIndi.ISS_OFF)
+)
+# (name, label, format, min, max, step, value)
+_EXPOSURE_NUMBERS = (
+    ("CCD_EXPOSURE_VALUE", "Duration (s)", "%5.2f", 0.001, 3600, 0.001, 1.0),
+)
+_GAIN_NUMBERS = (
+    ("GAIN", "Gain", "%3.0f", 0, 100, 1, 1),
+)
+
+def _make_switch_vector(name, label, group, switches, device):
+    """Build a one-of-many switch vector from (name, label, state) specs"""
+    prop = PyIndi.ISwitchVectorProperty()
+    prop.name = name
+    prop.label = label
+    prop.group = group
+    prop.p = device
+    prop.perm = PyIndi.IP_RW
+    prop.rule = PyIndi.ISR_1OFMANY
+    
+    prop.sp = []
+    for sw_name, sw_label, state in switches:
+        sw = PyIndi.ISwitch()
+        sw.name = sw_name
+        sw.label = sw_label
+        sw.s = state
+        prop.sp.append(sw)
+    prop.nsp = len(prop.sp)
+    return prop
+    
+def _make_number_vector(name, label, group, perm, device, numbers):
+    """Build a number vector from (name, label, format, min, max, step, value) specs"""
+    prop = PyIndi.INumberVectorProperty()
+    prop.name = name
+    prop.label = label
+    prop.group = group
+    prop.p = device
+    prop.perm = perm
+    
+    prop.np = []
+    for n_name, n_label, n_format, n_min, n_max, n_step, n_value in numbers:
+        n = PyIndi.INumber()
+        n.name = n_name
+        n.label = n_label
+        n.format = n_format
+        if n_min is not None:
+            n.min = n_min
+            n.max = n_max
+            n.step = n_step
+        n.value = n_value
+        prop.np.append(n)
+    prop.nsp = len(prop.np)
+    return prop
+
 class SeestarCamera(PyIndi.BaseDevice):
     def __init__(self, api: SeestarAPI, monitor: DeviceMonitor):
         super().__init__()
@@ -35,134 +99,46 @@ class SeestarCamera(PyIndi.BaseDevice):
         """Initialize the driver properties"""
         
         # Connection properties
-        self.connectProp = PyIndi.ISwitchVectorProperty()
-        self.connectProp.name = "CONNECTION"
-        self.connectProp.label = "Connection"
-        self.connectProp.group = "Main Control"
-        self.connectProp.p = self
-        self.connectProp.perm = PyIndi.IP_RW
-        self.connectProp.rule = PyIndi.ISR_1OFMANY
-        
-        connect_sw = PyIndi.ISwitch()
-        connect_sw.name = "CONNECT"
-        connect_sw.label = "Connect"
-        connect_sw.s = PyIndi.ISS_OFF
-        
-        disconnect_sw = PyIndi.ISwitch()
-        disconnect_sw.name = "DISCONNECT"
-        disconnect_sw.label = "Disconnect"
-        disconnect_sw.s = PyIndi.ISS_ON
-        
-        self.connectProp.nsp = 2
-        self.connectProp.sp = [connect_sw, disconnect_sw]
+        self.connectProp = _make_switch_vector(
+            "CONNECTION", "Connection", "Main Control", _CONNECTION_SWITCHES, self
+        )
         self.defineProperty(self.connectProp)
         
         # CCD Properties
-        self.ccdInfoProp = PyIndi.INumberVectorProperty()
-        self.ccdInfoProp.name = "CCD_INFO"
-        self.ccdInfoProp.label = "CCD Information"
-        self.ccdInfoProp.group = "Image Info"
-        self.ccdInfoProp.p = self
-        self.ccdInfoProp.perm = PyIndi.IP_RO
-        
-        width_n = PyIndi.INumber()
-        width_n.name = "CCD_MAX_X"
-        width_n.label = "Width"
-        width_n.format = "%4.0f"
-        width_n.value = self.image_width
-        
-        height_n = PyIndi.INumber()
-        height_n.name = "CCD_MAX_Y"
-        height_n.label = "Height"
-        height_n.format = "%4.0f"
-        height_n.value = self.image_height
-        
-        pixel_size_n = PyIndi.INumber()
-        pixel_size_n.name = "CCD_PIXEL_SIZE"
-        pixel_size_n.label = "Pixel Size (um)"
-        pixel_size_n.format = "%6.2f"
-        pixel_size_n.value = self.pixel_size
-        
-        bit_depth_n = PyIndi.INumber()
-        bit_depth_n.name = "CCD_BITSPERPIXEL"
-        bit_depth_n.label = "Bits per Pixel"
-        bit_depth_n.format = "%3.0f"
-        bit_depth_n.value = self.bit_depth
-        
-        self.ccdInfoProp.nsp = 4
-        self.ccdInfoProp.np = [width_n, height_n, pixel_size_n, bit_depth_n]
+        self.ccdInfoProp = _make_number_vector(
+            "CCD_INFO", "CCD Information", "Image Info", PyIndi.IP_RO, self,
+            [
+                ("CCD_MAX_X", "Width", "%4.0f", None, None, None, self.image_width),
+                ("CCD_MAX_Y", "Height", "%4.0f", None, None, None, self.image_height),
+                ("CCD_PIXEL_SIZE", "Pixel Size (um)", "%6.2f", None, None, None, self.pixel_size),
+                ("CCD_BITSPERPIXEL", "Bits per Pixel", "%3.0f", None, None, None, self.bit_depth)
+            ]
+        )
         
         # Exposure property
-        self.exposureProp = PyIndi.INumberVectorProperty()
-        self.exposureProp.name = "CCD_EXPOSURE"
-        self.exposureProp.label = "Exposure"
-        self.exposureProp.group = "Main Control"
-        self.exposureProp.p = self
-        self.exposureProp.perm = PyIndi.IP_RW
-        
-        exposure_n = PyIndi.INumber()
-        exposure_n.name = "CCD_EXPOSURE_VALUE"
-        exposure_n.label = "Duration (s)"
-        exposure_n.format = "%5.2f"
-        exposure_n.min = 0.001
-        exposure_n.max = 3600
-        exposure_n.step = 0.001
-        exposure_n.value = 1.0
-        
-        self.exposureProp.nsp = 1
-        self.exposureProp.np = [exposure_n]
+        self.exposureProp = _make_number_vector(
+            "CCD_EXPOSURE", "Exposure", "Main Control", PyIndi.IP_RW, self, _EXPOSURE_NUMBERS
+        )
         
         # Gain property
-        self.gainProp = PyIndi.INumberVectorProperty()
-        self.gainProp.name = "CCD_GAIN"
-        self.gainProp.label = "Gain"
-        self.gainProp.group = "Image Settings"
-        self.gainProp.p = self
-        self.gainProp.perm = PyIndi.IP_RW
-        
-        gain_n = PyIndi.INumber()
-        gain_n.name = "GAIN"
-        gain_n.label = "Gain"
-        gain_n.format = "%3.0f"
-        gain_n.min = 0
-        gain_n.max = 100
-        gain_n.step = 1
-        gain_n.value = 1
-        
-        self.gainProp.nsp = 1
-        self.gainProp.np = [gain_n]
+        self.gainProp = _make_number_vector(
+            "CCD_GAIN", "Gain", "Image Settings", PyIndi.IP_RW, self, _GAIN_NUMBERS
+        )
         
         # Frame type property
-        self.frameTypeProp = PyIndi.ISwitchVectorProperty()
-        self.frameTypeProp.name = "CCD_FRAME_TYPE"
-        self.frameTypeProp.label = "Frame Type"
-        self.frameTypeProp.group = "Image Settings"
-        self.frameTypeProp.p = self
-        self.frameTypeProp.perm = PyIndi.IP_RW
-        self.frameTypeProp.rule = PyIndi.ISR_1OFMANY
-        
-        light_sw = PyIndi.ISwitch()
-        light_sw.name = "FRAME_LIGHT"
-        light_sw.label = "Light"
-        light_sw.s = PyIndi.ISS_ON
-        
-        bias_sw = PyIndi.ISwitch()
-        bias_sw.name = "FRAME_BIAS"
-        bias_sw.label = "Bias"
-        bias_sw.s = PyIndi.ISS_OFF
-        
-        dark_sw = PyIndi.ISwitch()
-        dark_sw.name = "FRAME_DARK"
-        dark_sw.label = "Dark"
-        dark_sw.s = PyIndi.ISS_OFF
-        
-        flat_sw = PyIndi.ISwitch()
-        flat_sw.name = "FRAME_FLAT"
-        flat_sw.label = "Flat"
-        flat_sw.s = PyIndi.ISS_OFF
-        
-        self.frameTypeProp.nsp = 4
-        self.frameTypeProp.sp = [light_sw, bias_sw, dark_sw, flat_sw]
+        self.frameTypeProp = _make_switch_vector(
+            "CCD_FRAME_TYPE", "Frame Type", "Image Settings", _FRAME_TYPE_SWITCHES, self
+        )
+        
+        # Property update handlers, by property name
+        self._num_handlers = {
+            "CCD_EXPOSURE": self._handle_exposure_set,
+            "CCD_GAIN": self._handle_gain_set
+        }
+        self._sw_handlers = {
+            "CONNECTION": self._handle_connection,
+            "CCD_FRAME_TYPE": self._handle_frame_type
+        }
         
         return True
         
@@ -182,64 +158,69 @@ class SeestarCamera(PyIndi.BaseDevice):
         
     def ISNewNumber(self, dev, name, values, names):
         """Handle number property changes"""
-        if name == "CCD_EXPOSURE":
-            exposure = self.IUFindNumber(values, "CCD_EXPOSURE_VALUE")
-            if not exposure:
-                return False
-                
-            if self.monitor.state.exposing:
-                self.IDMessage("Camera is already exposing")
-                return False
-                
-            # Start exposure via monitor
-            if self.monitor.start_exposure(exposure.value, int(self.gainProp.np[0].value)):
-                self.exposureProp.s = PyIndi.IPS_BUSY
-                self.IDSetNumber(self.exposureProp)
-                return True
-            else:
-                self.IDMessage("Failed to start exposure")
-                return False
-                
-        elif name == "CCD_GAIN":
-            gain = self.IUFindNumber(values, "GAIN")
-            if not gain:
-                return False
-                
-            if self.monitor.state.exposing:
-                self.IDMessage("Cannot change gain while exposing")
-                return False
-                
-            self.gainProp.np[0].value = gain.value
-            self.gainProp.s = PyIndi.IPS_OK
-            self.IDSetNumber(self.gainProp)
-            return True
-            
-        return False
+        handler = self._num_handlers.get(name)
+        return handler(values, names) if handler else False
         
     def ISNewSwitch(self, dev, name, states, names):
         """Handle switch property changes"""
-        if name == "CONNECTION":
-            connect = self.IUFindSwitch(states, "CONNECT")
-            disconnect = self.IUFindSwitch(states, "DISCONNECT")
+        handler = self._sw_handlers.get(name)
+        return handler(states, names) if handler else False
+        
+    def _handle_exposure_set(self, values, names):
+        """Handle new exposure request"""
+        exposure = self.IUFindNumber(values, "CCD_EXPOSURE_VALUE")
+        if not exposure:
+            return False
             
-            if connect.s == PyIndi.ISS_ON:
-                self.connectCamera()
-            else:
-                self.disconnectCamera()
-                
-            return True
+        if self.monitor.state.exposing:
+            self.IDMessage("Camera is already exposing")
+            return False
             
-        elif name == "CCD_FRAME_TYPE":
-            if self.monitor.state.exposing:
-                self.IDMessage("Cannot change frame type while exposing")
-                return False
-                
-            self.IUUpdateSwitch(self.frameTypeProp, states, names)
-            self.frameTypeProp.s = PyIndi.IPS_OK
-            self.IDSetSwitch(self.frameTypeProp)
+        # Start exposure via monitor
+        if self.monitor.start_exposure(exposure.value, int(self.gainProp.np[0].value)):
+            self.exposureProp.s = PyIndi.IPS_BUSY
+            self.IDSetNumber(self.exposureProp)
             return True
+        else:
+            self.IDMessage("Failed to start exposure")
+            return False
+            
+    def _handle_gain_set(self, values, names):
+        """Handle gain change"""
+        gain = self.IUFindNumber(values, "GAIN")
+        if not gain:
+            return False
             
-        return False
+        if self.monitor.state.exposing:
+            self.IDMessage("Cannot change gain while exposing")
+            return False
+            
+        self.gainProp.np[0].value = gain.value
+        self.gainProp.s = PyIndi.IPS_OK
+        self.IDSetNumber(self.gainProp)
+        return True
+        
+    def _handle_connection(self, states, names):
+        """Handle connect/disconnect switch"""
+        connect = self.IUFindSwitch(states, "CONNECT")
+        
+        if connect.s == PyIndi.ISS_ON:
+            self.connectCamera()
+        else:
+            self.disconnectCamera()
+            
+        return True
+        
+    def _handle_frame_type(self, states, names):
+        """Handle frame type change"""
+        if self.monitor.state.exposing:
+            self.IDMessage("Cannot change frame type while exposing")
+            return False
+            
+        self.IUUpdateSwitch(self.frameTypeProp, states, names)
+        self.frameTypeProp.s = PyIndi.IPS_OK
+        self.IDSetSwitch(self.frameTypeProp)
+        return True
         
     def connectCamera(self):
         """Connect to the camera"""
@@ -6,23 +6,39 @@ Command-line interface for Seestar INDI driver
 
 import argparse
 import sys
-import time
+from functools import cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
-from seestar_api import SeestarAPI
-from seestar_config import config_manager, Config
+from seestar_config import config_manager, Config, ConfigManager
 from seestar_logging import get_logger
-from seestar_monitor import DeviceMonitor
+
+# Status report keys and the DeviceState fields they are read from
+_STATUS_KEYS = (
+    "connected", "ra", "dec", "slewing", "tracking", "exposing",
+    "filter_position", "focus_position", "temperature", "error"
+)
+_STATUS_FIELDS = attrgetter(
+    "connected", "ra", "dec", "slewing", "tracking", "exposing",
+    "filter_position", "focus_position", "focus_temperature", "error"
+)
 
 class SeestarCLI:
     """Command-line interface for Seestar control"""
     
-    def __init__(self):
+    def __init__(self, config: Optional[ConfigManager] = None):
+        # Device modules load requests and friends, so only import them
+        # for commands that talk to the telescope
+        from seestar_api import SeestarAPI
+        from seestar_monitor import DeviceMonitor
+        
         self.logger = get_logger("SeestarCLI")
+        self.config_manager = config or config_manager
         self.api = SeestarAPI(
-            host=config_manager.config.api.host,
-            port=config_manager.config.api.port
+            host=self.config_manager.config.api.host,
+            port=self.config_manager.config.api.port,
+            cache_timeout=self.config_manager.config.api.cache_timeout
         )
         self.monitor = DeviceMonitor(self.api)
         
@@ -38,26 +54,15 @@ class SeestarCLI:
     def disconnect(self):
         """Disconnect from device"""
         self.monitor.stop()
+        self.api.close()
         
     def get_status(self) -> dict:
         """Get device status"""
-        state = self.monitor.get_state()
-        return {
-            "connected": state.connected,
-            "ra": state.ra,
-            "dec": state.dec,
-            "slewing": state.slewing,
-            "tracking": state.tracking,
-            "exposing": state.exposing,
-            "filter_position": state.filter_position,
-            "focus_position": state.focus_position,
-            "temperature": state.focus_temperature,
-            "error": state.error
-        }
+        return dict(zip(_STATUS_KEYS, _STATUS_FIELDS(self.monitor.get_state())))
         
     def goto(self, ra: float, dec: float) -> bool:
         """Slew to coordinates"""
-        return self.api.goto_target(str(ra), str(dec))
+        return self.api.goto_target(ra, dec)
         
     def sync(self, ra: float, dec: float) -> bool:
         """Sync to coordinates"""
@@ -70,7 +75,7 @@ class SeestarCLI:
     def expose(self, duration: float, gain: Optional[int] = None) -> bool:
         """Start exposure"""
         if gain is None:
-            gain = config_manager.config.camera.min_gain
+            gain = self.config_manager.config.camera.min_gain
         return self.monitor.start_exposure(duration, gain)
         
     def move_filter(self, position: int) -> bool:
@@ -96,8 +101,9 @@ class SeestarCLI:
         """Start auto focus"""
         return self.monitor.start_autofocus()
 
-def main():
-    """Main CLI entry point"""
+@cache
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser, once per process"""
     parser = argparse.ArgumentParser(description="Seestar INDI Driver CLI")
     
     # Global options
@@ -155,14 +161,30 @@ def main():
     focus_group.add_argument("--relative", type=int, help="Relative movement")
     focus_group.add_argument("--auto", action="store_true", help="Start auto focus")
     
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """Main CLI entry point"""
+    args = _build_parser().parse_args()
     
     # Handle configuration file
-    if args.config:
-        config_manager = ConfigManager(args.config)
+    manager = ConfigManager(args.config) if args.config else config_manager
+    
+    # Config commands don't need a device connection
+    if args.command == "config":
+        if args.config_command == "show":
+            print(manager.get_default_config())
+        elif args.config_command == "save-default":
+            with open(args.path, "w") as f:
+                f.write(manager.get_default_config())
+            print(f"Default configuration saved to {args.path}")
+        elif args.config_command == "update":
+            manager.update_config(args.section, {args.key: args.value})
+            print(f"Configuration updated: {args.section}.{args.key} = {args.value}")
+        return
         
     # Setup CLI
-    cli = SeestarCLI()
+    cli = SeestarCLI(manager)
     
     # Handle commands
     if args.command == "status":
@@ -172,17 +194,6 @@ def main():
         for key, value in status.items():
             print(f"{key}: {value}")
             
-    elif args.command == "config":
-        if args.config_command == "show":
-            print(config_manager.get_default_config())
-        elif args.config_command == "save-default":
-            with open(args.path, "w") as f:
-                f.write(config_manager.get_default_config())
-            print(f"Default configuration saved to {args.path}")
-        elif args.config_command == "update":
-            config_manager.update_config(args.section, {args.key: args.value})
-            print(f"Configuration updated: {args.section}.{args.key} = {args.value}")
-            
     elif args.command == "goto":
         if not cli.connect():
             sys.exit(1)
@@ -215,8 +226,7 @@ def main():
             sys.exit(1)
         if cli.expose(args.duration, args.gain):
             print("Exposure started")
-            while cli.monitor.state.exposing:
-                time.sleep(0.1)
+            cli.monitor.exposure_done.wait()
             print("Exposure complete")
         else:
             print("Exposure failed")
@@ -249,8 +259,7 @@ def main():
         elif args.auto:
             if cli.auto_focus():
                 print("Auto focus started")
-                while cli.monitor.state.auto_focusing:
-                    time.sleep(0.1)
+                cli.monitor.autofocus_done.wait()
                 print("Auto focus complete")
             else:
                 print("Auto focus failed")
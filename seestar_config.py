@@ -5,13 +5,23 @@ Configuration management for Seestar INDI driver
 """
 
 import os
+import sys
+from functools import cache
 from pathlib import Path
 from typing import Any, Dict, Optional
-import tomli
 import tomli_w
-from dataclasses import dataclass, asdict
 
-@dataclass
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    import tomli as tomllib
+from dataclasses import dataclass, fields
+
+# Config objects only ever hold their declared fields; drop the per-instance
+# __dict__ where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class CameraConfig:
     """Camera configuration"""
     image_width: int = 1920
@@ -23,7 +33,7 @@ class CameraConfig:
     min_gain: int = 0
     max_gain: int = 100
     
-@dataclass
+@dataclass(**_SLOTS)
 class FocuserConfig:
     """Focuser configuration"""
     max_position: int = 100000
@@ -31,7 +41,7 @@ class FocuserConfig:
     backlash: int = 0
     temperature_compensation: bool = True
     
-@dataclass
+@dataclass(**_SLOTS)
 class FilterWheelConfig:
     """Filter wheel configuration"""
     filter_names: list[str] = None
@@ -40,7 +50,7 @@ class FilterWheelConfig:
         if self.filter_names is None:
             self.filter_names = ["Clear", "LP"]
             
-@dataclass
+@dataclass(**_SLOTS)
 class APIConfig:
     """API configuration"""
     host: str = "localhost"
@@ -50,7 +60,7 @@ class APIConfig:
     retry_delay: float = 0.5
     cache_timeout: float = 0.5
     
-@dataclass
+@dataclass(**_SLOTS)
 class Config:
     """Main configuration"""
     camera: CameraConfig = None
@@ -68,16 +78,54 @@ class Config:
         if self.api is None:
             self.api = APIConfig()
 
+# Field types per section, for coercing values given as strings
+_FIELD_TYPES: Dict[str, Dict[str, Any]] = {
+    section: {f.name: f.type for f in fields(cls)}
+    for section, cls in (
+        ("camera", CameraConfig),
+        ("focuser", FocuserConfig),
+        ("filterwheel", FilterWheelConfig),
+        ("api", APIConfig)
+    )
+}
+
+def _coerce(field_type: Any, value: Any) -> Any:
+    """Convert a string value to the type of its config field"""
+    if not isinstance(value, str) or field_type is str:
+        return value
+    if field_type is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if field_type in (int, float):
+        return field_type(value)
+    # Lists are given comma-separated
+    return [item.strip() for item in value.split(",")]
+
+def shallow_dict(obj) -> Dict[str, Any]:
+    """Convert a flat config dataclass to a dict without asdict's deep copy"""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+@cache
+def _default_config_toml() -> str:
+    """Render the default configuration once per process"""
+    config = Config()
+    data = {
+        "camera": shallow_dict(config.camera),
+        "focuser": shallow_dict(config.focuser),
+        "filterwheel": shallow_dict(config.filterwheel),
+        "api": shallow_dict(config.api)
+    }
+    return tomli_w.dumps(data)
+
+# Resolved once at import, like the global config_manager below
+_DEFAULT_CONFIG_DIR = Path(
+    os.environ.get("SEESTAR_CONFIG_DIR") or Path.home() / ".config" / "seestar"
+)
+
 class ConfigManager:
     """Configuration manager"""
     
     def __init__(self, config_dir: Optional[str] = None):
-        if config_dir is None:
-            config_dir = os.environ.get(
-                "SEESTAR_CONFIG_DIR",
-                str(Path.home() / ".config" / "seestar")
-            )
-        self.config_dir = Path(config_dir)
+        self.config_dir = Path(config_dir) if config_dir is not None else _DEFAULT_CONFIG_DIR
         self.config_file = self.config_dir / "config.toml"
         self.config = self.load_config()
         
@@ -90,7 +138,7 @@ class ConfigManager:
         if self.config_file.exists():
             try:
                 with open(self.config_file, "rb") as f:
-                    data = tomli.load(f)
+                    data = tomllib.load(f)
                     
                 # Update camera config
                 if "camera" in data:
@@ -117,33 +165,26 @@ class ConfigManager:
     def save_config(self):
         """Save configuration to file"""
         # Create config directory if needed
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        if not self.config_dir.is_dir():
+            self.config_dir.mkdir(parents=True, exist_ok=True)
         
         # Convert config to dictionary
         data = {
-            "camera": asdict(self.config.camera),
-            "focuser": asdict(self.config.focuser),
-            "filterwheel": asdict(self.config.filterwheel),
-            "api": asdict(self.config.api)
+            "camera": shallow_dict(self.config.camera),
+            "focuser": shallow_dict(self.config.focuser),
+            "filterwheel": shallow_dict(self.config.filterwheel),
+            "api": shallow_dict(self.config.api)
         }
         
-        # Save to file
+        # Save to file with a single write
         try:
-            with open(self.config_file, "wb") as f:
-                tomli_w.dump(data, f)
+            self.config_file.write_bytes(tomli_w.dumps(data).encode())
         except Exception as e:
             print(f"Error saving config: {e}")
             
     def get_default_config(self) -> str:
         """Get default configuration as TOML string"""
-        config = Config()
-        data = {
-            "camera": asdict(config.camera),
-            "focuser": asdict(config.focuser),
-            "filterwheel": asdict(config.filterwheel),
-            "api": asdict(config.api)
-        }
-        return tomli_w.dumps(data)
+        return _default_config_toml()
         
     def update_config(self, section: str, updates: Dict[str, Any]):
         """
@@ -153,16 +194,26 @@ class ConfigManager:
             section: Configuration section (camera, focuser, filterwheel, api)
             updates: Dictionary of updates
         """
-        if not hasattr(self.config, section):
+        field_types = _FIELD_TYPES.get(section)
+        if field_types is None:
             raise ValueError(f"Invalid config section: {section}")
             
         current = getattr(self.config, section)
+        changed = False
         for key, value in updates.items():
-            if not hasattr(current, key):
+            if key not in field_types:
                 raise ValueError(f"Invalid config key: {key}")
-            setattr(current, key, value)
-            
-        self.save_config()
+            try:
+                value = _coerce(field_types[key], value)
+            except ValueError:
+                raise ValueError(f"Invalid value for {section}.{key}: {value!r}")
+            if getattr(current, key) != value:
+                setattr(current, key, value)
+                changed = True
+                
+        # Only rewrite the file when something actually changed
+        if changed:
+            self.save_config()
 
 # Global configuration instance
 config_manager = ConfigManager()
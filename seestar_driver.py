@@ -13,6 +13,14 @@ from seestar_focuser import SeestarFocuser
 from seestar_api import SeestarAPI
 from seestar_monitor import DeviceMonitor
 
+# Property name prefix (text before the first "_") -> attribute of the
+# device handling it; everything else goes to the mount
+_DEVICE_PREFIXES = {
+    "CCD": "camera",
+    "FILTER": "filterwheel",
+    "FOCUS": "focuser"
+}
+
 class ExtendedSeestarDevice(SeeStarDevice):
     def __init__(self, name=None, number=1):
         """
@@ -34,6 +42,11 @@ class ExtendedSeestarDevice(SeeStarDevice):
         self.filterwheel = SeestarFilterWheel(self.api, self.monitor)
         self.focuser = SeestarFocuser(self.api, self.monitor)
         
+        # Devices owning each property name prefix
+        self._prefix_map = {
+            prefix: getattr(self, attr) for prefix, attr in _DEVICE_PREFIXES.items()
+        }
+        
         # Register state change callbacks
         self.monitor.add_event_callback("state_change", self._handle_state_change)
         
@@ -49,17 +62,19 @@ class ExtendedSeestarDevice(SeeStarDevice):
         self.filterwheel.initProperties()
         self.focuser.initProperties()
         
+    def _route(self, name):
+        """Get the additional device owning a property, or None for the mount"""
+        prefix, sep, _ = name.partition("_")
+        return self._prefix_map.get(prefix) if sep else None
+        
     def ISNewNumber(self, device, name, names, values):
         """
         Handle number property changes for all devices
         """
         # Check if the property belongs to additional devices
-        if name.startswith("CCD_"):
-            return self.camera.ISNewNumber(device, name, names, values)
-        elif name.startswith("FILTER_"):
-            return self.filterwheel.ISNewNumber(device, name, names, values)
-        elif name.startswith("FOCUS_"):
-            return self.focuser.ISNewNumber(device, name, names, values)
+        target = self._route(name)
+        if target is not None:
+            return target.ISNewNumber(device, name, names, values)
             
         # Otherwise, handle mount properties
         return super().ISNewNumber(device, name, names, values)
@@ -78,12 +93,9 @@ class ExtendedSeestarDevice(SeeStarDevice):
                 self.monitor.stop()
                 
         # Check if the property belongs to additional devices
-        if name.startswith("CCD_"):
-            return self.camera.ISNewSwitch(device, name, names, values)
-        elif name.startswith("FILTER_"):
-            return self.filterwheel.ISNewSwitch(device, name, names, values)
-        elif name.startswith("FOCUS_"):
-            return self.focuser.ISNewSwitch(device, name, names, values)
+        target = self._route(name)
+        if target is not None:
+            return target.ISNewSwitch(device, name, names, values)
             
         # Otherwise, handle mount properties
         return super().ISNewSwitch(device, name, names, values)
@@ -93,12 +105,9 @@ class ExtendedSeestarDevice(SeeStarDevice):
         Handle text property changes for all devices
         """
         # Check if the property belongs to additional devices
-        if name.startswith("CCD_"):
-            return self.camera.ISNewText(device, name, names, values)
-        elif name.startswith("FILTER_"):
-            return self.filterwheel.ISNewText(device, name, names, values)
-        elif name.startswith("FOCUS_"):
-            return self.focuser.ISNewText(device, name, names, values)
+        target = self._route(name)
+        if target is not None:
+            return target.ISNewText(device, name, names, values)
             
         # Otherwise, handle mount properties
         return super().ISNewText(device, name, names, values)
@@ -151,6 +160,7 @@ class ExtendedSeestarDevice(SeeStarDevice):
     def Cleanup(self):
         """Clean up resources"""
         self.monitor.stop()
+        self.api.close()
         super().Cleanup()
 
 # Only create the extended device if this file is run directly
@@ -6,15 +6,22 @@ INDI Filter Wheel Driver for Seestar Telescope
 
 import PyIndi
 import logging
-from threading import Lock
+from threading import Lock, Timer
 from seestar_api import SeestarAPI
 from seestar_monitor import DeviceMonitor
 
 class SeestarFilterWheel(PyIndi.BaseDevice):
+    """
+    INDI filter wheel backed by the Seestar LP filter
+    
+    Filter state is owned by the DeviceMonitor: INDI callbacks only ask it
+    to move, and state changes arrive on the monitor's event thread, so the
+    driver itself holds no lock around filter state.
+    """
+    
     def __init__(self, api: SeestarAPI, monitor: DeviceMonitor):
         super().__init__()
         self.logger = logging.getLogger("SeestarFilterWheel")
-        self.lock = Lock()
         
         # API and monitoring
         self.api = api
@@ -26,6 +33,26 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         # Filter settings
         self.filter_count = 2  # LP filter on/off
         self.filter_names = ["Clear", "LP"]  # Default filter names
+        self._filter_text_names = tuple(f"FILTER_NAME_{i+1}" for i in range(self.filter_count))
+        self._update_filter_messages()
+        
+        # A filter move reports position and motion separately; send the
+        # slot property once for events arriving within emit_delay
+        self.emit_delay = 0.005  # seconds
+        self._emit_lock = Lock()
+        self._emit_timer = None
+        
+        # Property elements by name, reused when properties are rebuilt
+        self._element_pool = {}
+        
+    def _pooled(self, element_type, name):
+        """Get the element of this name from the pool, creating it once"""
+        element = self._element_pool.get(name)
+        if element is None:
+            element = element_type()
+            element.name = name
+            self._element_pool[name] = element
+        return element
         
     def initProperties(self):
         """Initialize the driver properties"""
@@ -39,13 +66,11 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         self.connectProp.perm = PyIndi.IP_RW
         self.connectProp.rule = PyIndi.ISR_1OFMANY
         
-        connect_sw = PyIndi.ISwitch()
-        connect_sw.name = "CONNECT"
+        connect_sw = self._pooled(PyIndi.ISwitch, "CONNECT")
         connect_sw.label = "Connect"
         connect_sw.s = PyIndi.ISS_OFF
         
-        disconnect_sw = PyIndi.ISwitch()
-        disconnect_sw.name = "DISCONNECT"
+        disconnect_sw = self._pooled(PyIndi.ISwitch, "DISCONNECT")
         disconnect_sw.label = "Disconnect"
         disconnect_sw.s = PyIndi.ISS_ON
         
@@ -61,8 +86,7 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         self.filterSlotProp.p = self
         self.filterSlotProp.perm = PyIndi.IP_RW
         
-        filter_n = PyIndi.INumber()
-        filter_n.name = "FILTER_SLOT_VALUE"
+        filter_n = self._pooled(PyIndi.INumber, "FILTER_SLOT_VALUE")
         filter_n.label = "Filter Position"
         filter_n.format = "%3.0f"
         filter_n.min = 1
@@ -82,11 +106,10 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         self.filterNamesProp.perm = PyIndi.IP_RW
         
         filter_names = []
-        for i in range(self.filter_count):
-            filter_t = PyIndi.IText()
-            filter_t.name = f"FILTER_NAME_{i+1}"
+        for i, (text_name, name) in enumerate(zip(self._filter_text_names, self.filter_names)):
+            filter_t = self._pooled(PyIndi.IText, text_name)
             filter_t.label = f"Filter #{i+1}"
-            filter_t.text = self.filter_names[i]
+            filter_t.text = name
             filter_names.append(filter_t)
             
         self.filterNamesProp.ntp = self.filter_count
@@ -94,6 +117,10 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         
         return True
         
+    def _update_filter_messages(self):
+        """Prebuild the filter change messages for the current names"""
+        self._filter_messages = tuple(f"Filter changed to {name}" for name in self.filter_names)
+        
     def updateProperties(self):
         """Update properties when connection changes"""
         if self.isConnected():
@@ -136,11 +163,18 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
     def ISNewText(self, dev, name, texts, names):
         """Handle text property changes"""
         if name == "FILTER_NAME":
-            # Update filter names
-            for i in range(self.filter_count):
-                filter_name = self.IUFindText(texts, f"FILTER_NAME_{i+1}")
+            # Update filter names, all or none: an empty name is rejected
+            new_names = list(self.filter_names)
+            for i, text_name in enumerate(self._filter_text_names):
+                filter_name = self.IUFindText(texts, text_name)
                 if filter_name:
-                    self.filter_names[i] = filter_name.text
+                    if not filter_name.text.strip():
+                        self.filterNamesProp.s = PyIndi.IPS_ALERT
+                        self.IDSetText(self.filterNamesProp)
+                        return False
+                    new_names[i] = filter_name.text
+            self.filter_names[:] = new_names
+            self._update_filter_messages()
                     
             self.filterNamesProp.s = PyIndi.IPS_OK
             self.IDSetText(self.filterNamesProp)
@@ -152,7 +186,6 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         """Handle switch property changes"""
         if name == "CONNECTION":
             connect = self.IUFindSwitch(states, "CONNECT")
-            disconnect = self.IUFindSwitch(states, "DISCONNECT")
             
             if connect.s == PyIndi.ISS_ON:
                 self.connectFilterWheel()
@@ -177,23 +210,37 @@ class SeestarFilterWheel(PyIndi.BaseDevice):
         self.IDMessage("Filter wheel disconnected successfully")
         return True
         
+    def _schedule_slot_update(self):
+        """Send the filter slot property after emit_delay, once per burst"""
+        with self._emit_lock:
+            if self._emit_timer is None:
+                self._emit_timer = Timer(self.emit_delay, self._flush_slot_update)
+                self._emit_timer.daemon = True
+                self._emit_timer.start()
+                
+    def _flush_slot_update(self):
+        """Send the pending filter slot update"""
+        with self._emit_lock:
+            self._emit_timer = None
+        self.IDSetNumber(self.filterSlotProp)
+        
     def _handle_state_change(self, event):
         """Handle state changes"""
         if event["property"] == "filter_position":
             # Update position display (convert to 1-based index)
             self.filterSlotProp.np[0].value = event["new_value"] + 1
             self.filterSlotProp.s = PyIndi.IPS_OK
-            self.IDSetNumber(self.filterSlotProp)
-            self.IDMessage(f"Filter changed to {self.filter_names[event['new_value']]}")
+            self._schedule_slot_update()
+            self.IDMessage(self._filter_messages[event["new_value"]])
             
         elif event["property"] == "filter_moving":
             if event["new_value"]:
                 self.filterSlotProp.s = PyIndi.IPS_BUSY
             else:
                 self.filterSlotProp.s = PyIndi.IPS_OK
-            self.IDSetNumber(self.filterSlotProp)
+            self._schedule_slot_update()
             
         elif event["property"] == "error" and event["new_value"]:
             self.IDMessage(f"Filter wheel error: {event['new_value']}")
             self.filterSlotProp.s = PyIndi.IPS_ALERT
-            self.IDSetNumber(self.filterSlotProp)
+            self._schedule_slot_update()
@@ -6,22 +6,36 @@ INDI Focuser Driver for Seestar Telescope
 
 import PyIndi
 import logging
-from threading import Lock
+import numpy as np
 from seestar_api import SeestarAPI
 from seestar_monitor import DeviceMonitor
 
 class SeestarFocuser(PyIndi.BaseDevice):
+    """
+    INDI focuser for the Seestar's built-in focuser
+    
+    Whether the focuser is busy is read from the DeviceMonitor state, and
+    state changes arrive on the monitor's event thread, so the driver
+    itself holds no lock.
+    """
+    
     def __init__(self, api: SeestarAPI, monitor: DeviceMonitor):
         super().__init__()
         self.logger = logging.getLogger("SeestarFocuser")
-        self.lock = Lock()
         
         # API and monitoring
         self.api = api
         self.monitor = monitor
         
-        # Register for state changes
-        self.monitor.add_event_callback("state_change", self._handle_state_change)
+        # Register for changes of the focuser's own state
+        for prop, callback in (
+            ("focus_position", self._on_focus_position),
+            ("focus_moving", self._on_focus_moving),
+            ("auto_focusing", self._on_auto_focusing),
+            ("focus_temperature", self._on_focus_temperature),
+            ("error", self._on_error)
+        ):
+            self.monitor.add_event_callback(prop, callback)
         
         # Focuser settings
         self.max_position = 100000  # Maximum steps
@@ -128,6 +142,23 @@ class SeestarFocuser(PyIndi.BaseDevice):
         self.temperatureProp.nsp = 1
         self.temperatureProp.np = [temp_n]
         
+        # Focus metric
+        self.focusMetricProp = PyIndi.INumberVectorProperty()
+        self.focusMetricProp.name = "FOCUS_HFD"
+        self.focusMetricProp.label = "Focus Metric"
+        self.focusMetricProp.group = "Main Control"
+        self.focusMetricProp.p = self
+        self.focusMetricProp.perm = PyIndi.IP_RO
+        
+        hfd_n = PyIndi.INumber()
+        hfd_n.name = "HFD"
+        hfd_n.label = "HFD (pixels)"
+        hfd_n.format = "%6.2f"
+        hfd_n.value = 0
+        
+        self.focusMetricProp.nsp = 1
+        self.focusMetricProp.np = [hfd_n]
+        
         return True
         
     def updateProperties(self):
@@ -137,11 +168,13 @@ class SeestarFocuser(PyIndi.BaseDevice):
             self.defineProperty(self.relativeProp)
             self.defineProperty(self.autoFocusProp)
             self.defineProperty(self.temperatureProp)
+            self.defineProperty(self.focusMetricProp)
         else:
             self.deleteProperty(self.positionProp.name)
             self.deleteProperty(self.relativeProp.name)
             self.deleteProperty(self.autoFocusProp.name)
             self.deleteProperty(self.temperatureProp.name)
+            self.deleteProperty(self.focusMetricProp.name)
         return True
         
     def ISNewNumber(self, dev, name, values, names):
@@ -150,61 +183,45 @@ class SeestarFocuser(PyIndi.BaseDevice):
             position = self.IUFindNumber(values, "FOCUS_ABSOLUTE_POSITION")
             if not position:
                 return False
-                
-            if self.monitor.state.focus_moving or self.monitor.state.auto_focusing:
-                self.IDMessage("Focuser is already moving")
-                return False
-                
-            target = int(position.value)
-            if target < 0 or target > self.max_position:
-                self.IDMessage(f"Target position {target} is out of range")
-                return False
-                
-            # Move focuser via API
-            if self.api.send_command("method_sync", {
-                "method": "set_focus_position",
-                "params": {"position": target}
-            }):
-                self.positionProp.s = PyIndi.IPS_BUSY
-                self.IDSetNumber(self.positionProp)
-                return True
-            else:
-                self.IDMessage("Failed to move focuser")
-                return False
+            return self._move_to(int(position.value))
                 
         elif name == "REL_FOCUS_POSITION":
             steps = self.IUFindNumber(values, "FOCUS_RELATIVE_POSITION")
             if not steps:
                 return False
-                
-            if self.monitor.state.focus_moving or self.monitor.state.auto_focusing:
-                self.IDMessage("Focuser is already moving")
-                return False
-                
-            target = self.monitor.state.focus_position + int(steps.value)
-            if target < 0 or target > self.max_position:
-                self.IDMessage(f"Target position {target} is out of range")
-                return False
-                
-            # Move focuser via API
-            if self.api.send_command("method_sync", {
-                "method": "set_focus_position",
-                "params": {"position": target}
-            }):
-                self.positionProp.s = PyIndi.IPS_BUSY
-                self.IDSetNumber(self.positionProp)
-                return True
-            else:
-                self.IDMessage("Failed to move focuser")
-                return False
+            return self._move_to(int(steps.value), relative=True)
                 
         return False
         
+    def _move_to(self, target, relative=False):
+        """Move the focuser to a position, or by a number of steps if relative"""
+        state = self.monitor.state
+        if state.focus_moving or state.auto_focusing:
+            self.IDMessage("Focuser is already moving")
+            return False
+            
+        if relative:
+            target += state.focus_position
+        if target < 0 or target > self.max_position:
+            self.IDMessage(f"Target position {target} is out of range")
+            return False
+            
+        # Move focuser via API
+        if self.api.send_command("method_sync", {
+            "method": "set_focus_position",
+            "params": {"position": target}
+        }):
+            self.positionProp.s = PyIndi.IPS_BUSY
+            self.IDSetNumber(self.positionProp)
+            return True
+        else:
+            self.IDMessage("Failed to move focuser")
+            return False
+        
     def ISNewSwitch(self, dev, name, states, names):
         """Handle switch property changes"""
         if name == "CONNECTION":
             connect = self.IUFindSwitch(states, "CONNECT")
-            disconnect = self.IUFindSwitch(states, "DISCONNECT")
             
             if connect.s == PyIndi.ISS_ON:
                 self.connectFocuser()
@@ -216,7 +233,8 @@ class SeestarFocuser(PyIndi.BaseDevice):
         elif name == "FOCUS_AUTO":
             auto = self.IUFindSwitch(states, "FOCUS_AUTO_TOGGLE")
             if auto.s == PyIndi.ISS_ON:
-                if self.monitor.state.focus_moving or self.monitor.state.auto_focusing:
+                state = self.monitor.state
+                if state.focus_moving or state.auto_focusing:
                     self.IDMessage("Focuser is already moving")
                     return False
                     
@@ -247,35 +265,48 @@ class SeestarFocuser(PyIndi.BaseDevice):
         self.IDMessage("Focuser disconnected successfully")
         return True
         
-    def _handle_state_change(self, event):
-        """Handle state changes"""
-        if event["property"] == "focus_position":
-            self.positionProp.np[0].value = event["new_value"]
-            if not self.monitor.state.focus_moving:
-                self.positionProp.s = PyIndi.IPS_OK
-                self.IDSetNumber(self.positionProp)
-                
-        elif event["property"] == "focus_moving":
-            if event["new_value"]:
-                self.positionProp.s = PyIndi.IPS_BUSY
-            else:
-                self.positionProp.s = PyIndi.IPS_OK
+    def update_focus_metric(self, image: np.ndarray) -> float:
+        """Measure and report the HFD of an autofocus frame"""
+        from seestar_focus_metric import central_hfd
+        hfd = central_hfd(image)
+        self.focusMetricProp.np[0].value = hfd
+        self.focusMetricProp.s = PyIndi.IPS_OK
+        self.IDSetNumber(self.focusMetricProp)
+        return hfd
+        
+    def _on_focus_position(self, event):
+        """Handle focuser position changes"""
+        self.positionProp.np[0].value = event["new_value"]
+        if not self.monitor.state.focus_moving:
+            self.positionProp.s = PyIndi.IPS_OK
             self.IDSetNumber(self.positionProp)
             
-        elif event["property"] == "auto_focusing":
-            if event["new_value"]:
-                self.autoFocusProp.s = PyIndi.IPS_BUSY
-            else:
-                self.autoFocusProp.sp[0].s = PyIndi.ISS_OFF
-                self.autoFocusProp.s = PyIndi.IPS_OK
-            self.IDSetSwitch(self.autoFocusProp)
-            
-        elif event["property"] == "focus_temperature":
-            self.temperatureProp.np[0].value = event["new_value"]
-            self.temperatureProp.s = PyIndi.IPS_OK
-            self.IDSetNumber(self.temperatureProp)
-            
-        elif event["property"] == "error" and event["new_value"]:
+    def _on_focus_moving(self, event):
+        """Handle focuser movement starting or stopping"""
+        if event["new_value"]:
+            self.positionProp.s = PyIndi.IPS_BUSY
+        else:
+            self.positionProp.s = PyIndi.IPS_OK
+        self.IDSetNumber(self.positionProp)
+        
+    def _on_auto_focusing(self, event):
+        """Handle auto focus starting or finishing"""
+        if event["new_value"]:
+            self.autoFocusProp.s = PyIndi.IPS_BUSY
+        else:
+            self.autoFocusProp.sp[0].s = PyIndi.ISS_OFF
+            self.autoFocusProp.s = PyIndi.IPS_OK
+        self.IDSetSwitch(self.autoFocusProp)
+        
+    def _on_focus_temperature(self, event):
+        """Handle focuser temperature changes"""
+        self.temperatureProp.np[0].value = event["new_value"]
+        self.temperatureProp.s = PyIndi.IPS_OK
+        self.IDSetNumber(self.temperatureProp)
+        
+    def _on_error(self, event):
+        """Handle device errors"""
+        if event["new_value"]:
             self.IDMessage(f"Focuser error: {event['new_value']}")
             self.positionProp.s = PyIndi.IPS_ALERT
             self.IDSetNumber(self.positionProp)
@@ -6,21 +6,29 @@ Handles ASCOM bridge, FITS handling, and plate solving
 """
 
 import os
+import subprocess
+import threading
 import time
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from astropy.io import fits
 from astropy.wcs import WCS
 from astropy.coordinates import SkyCoord
 from astropy import units as u
 from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 
 from seestar_logging import get_logger
 from seestar_config import config_manager
 
 logger = get_logger("SeestarIntegration")
 
+def _utc_timestamp() -> str:
+    """Current UTC time in the FITS DATE-OBS format"""
+    # FITS timestamps carry no UTC offset
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
 @dataclass
 class FITSHeader:
     """FITS header information"""
@@ -33,7 +41,7 @@ class FITSHeader:
     dec: float
     telescope: str = "Seestar S50"
     observer: str = "Seestar INDI Driver"
-    date_obs: str = datetime.utcnow().isoformat()
+    date_obs: str = field(default_factory=_utc_timestamp)
 
 class FITSHandler:
     """FITS file handler"""
@@ -41,116 +49,231 @@ class FITSHandler:
         self.save_path = save_path
         os.makedirs(save_path, exist_ok=True)
         
-    def save_fits(self, data: np.ndarray, header: FITSHeader,
-                 filename: Optional[str] = None) -> str:
-        """Save image data as FITS file"""
-        # Create FITS header
-        hdr = fits.Header()
-        hdr['TELESCOP'] = header.telescope
-        hdr['OBSERVER'] = header.observer
-        hdr['OBJECT'] = header.object_name
-        hdr['EXPTIME'] = header.exposure_time
-        hdr['GAIN'] = header.gain
-        hdr['CCD-TEMP'] = header.temperature
-        hdr['FILTER'] = header.filter_name
-        hdr['RA'] = header.ra
-        hdr['DEC'] = header.dec
-        hdr['DATE-OBS'] = header.date_obs
+        # Header with every keyword in place, so each frame only sets values
+        self._header_template = fits.Header([
+            (key, None) for key in (
+                'TELESCOP', 'OBSERVER', 'OBJECT', 'EXPTIME', 'GAIN',
+                'CCD-TEMP', 'FILTER', 'RA', 'DEC', 'DATE-OBS'
+            )
+        ])
+        
+        # Writers for save_fits_async, so frames can flush while the next is taken
+        self._write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="SeestarFITS")
         
-        # Create FITS file
-        hdu = fits.PrimaryHDU(data=data, header=hdr)
+        # Generated filenames: directory prefix and the last formatted second
+        self._save_prefix = os.path.join(save_path, "")
+        self._stamp_lock = threading.Lock()
+        self._stamp_second = None
+        self._stamp = ""
+        self._stamp_count = 0
+        
+    def _timestamp(self) -> str:
+        """Timestamp for a generated filename, unique within this handler"""
+        now = int(time.time())
+        with self._stamp_lock:
+            # strftime only runs once per second; later frames in the same
+            # second get a counter so they don't overwrite each other
+            if now != self._stamp_second:
+                self._stamp_second = now
+                self._stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+                self._stamp_count = 0
+                return self._stamp
+            self._stamp_count += 1
+            return f"{self._stamp}_{self._stamp_count:04d}"
+        
+    def _build_hdu(self, data: np.ndarray, header: FITSHeader,
+                   filename: Optional[str]) -> Tuple[fits.PrimaryHDU, str]:
+        """Create the HDU and output path for an image"""
+        # Raw frames are stored as 16-bit unsigned integers, the sensor's
+        # native depth; wider integer arrays are narrowed to match when
+        # their values fit, narrower ones are written as they are
+        if data.dtype.kind in 'iu' and data.dtype.itemsize > 2:
+            if data.size and (data.min() < 0 or data.max() > 65535):
+                logger.warning(
+                    "Image values outside the 16-bit range, keeping %s", data.dtype
+                )
+            else:
+                data = data.astype(np.uint16)
+            
+        # Create FITS file. The HDU makes its own copy of the header, so the
+        # template is passed as is and the values are set on that copy.
+        # Contiguous, native-endian data keeps astropy on its bulk write path
+        hdu = fits.PrimaryHDU(
+            data=np.ascontiguousarray(data, dtype=data.dtype.newbyteorder('=')),
+            header=self._header_template,
+            do_not_scale_image_data=True,
+            ignore_blank=True
+        )
+        hdu.header.update([
+            ('TELESCOP', header.telescope),
+            ('OBSERVER', header.observer),
+            ('OBJECT', header.object_name),
+            ('EXPTIME', header.exposure_time),
+            ('GAIN', header.gain),
+            ('CCD-TEMP', header.temperature),
+            ('FILTER', header.filter_name),
+            ('RA', header.ra),
+            ('DEC', header.dec),
+            ('DATE-OBS', header.date_obs)
+        ])
         
         # Generate filename if not provided
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{header.object_name}_{timestamp}.fits"
+            return hdu, f"{self._save_prefix}{header.object_name}_{self._timestamp()}.fits"
             
-        # Save file
-        filepath = os.path.join(self.save_path, filename)
-        hdu.writeto(filepath, overwrite=True)
+        return hdu, os.path.join(self.save_path, filename)
         
-        logger.info(f"Saved FITS file: {filepath}")
+    def _write_hdu(self, hdu: fits.PrimaryHDU, filepath: str) -> str:
+        """Write an HDU to disk"""
+        # The header is built from known-good cards, so skip verification
+        hdu.writeto(filepath, overwrite=True, output_verify="ignore", checksum=False)
+        logger.info("Saved FITS file: %s", filepath)
         return filepath
         
-    def load_fits(self, filepath: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def save_fits(self, data: np.ndarray, header: FITSHeader,
+                 filename: Optional[str] = None) -> str:
+        """
+        Save image data as FITS file
+        
+        Integer frames are written as uint16 (BITPIX=16, BZERO=32768);
+        floating point data, such as processed frames, is written as is.
+        """
+        hdu, filepath = self._build_hdu(data, header, filename)
+        return self._write_hdu(hdu, filepath)
+        
+    def save_fits_async(self, data: np.ndarray, header: FITSHeader,
+                        filename: Optional[str] = None) -> Future:
+        """
+        Save image data as FITS file in the background
+        
+        The header is built right away; only the disk write is deferred.
+        The caller must not modify data until the returned future resolves
+        to the file path.
+        """
+        hdu, filepath = self._build_hdu(data, header, filename)
+        return self._write_pool.submit(self._write_hdu, hdu, filepath)
+        
+    def close(self):
+        """Wait for pending background writes and stop the writer threads"""
+        self._write_pool.shutdown(wait=True)
+        
+    def load_fits(self, filepath: str) -> Tuple[np.ndarray, fits.Header]:
         """Load FITS file"""
         with fits.open(filepath) as hdul:
             data = hdul[0].data
-            header = dict(hdul[0].header)
+            header = hdul[0].header
         return data, header
+        
+    def load_fits_header(self, filepath: str) -> fits.Header:
+        """Load only the primary header of a FITS file"""
+        return fits.getheader(filepath)
 
 class PlateSolver:
     """Plate solving handler"""
+    # Degrees around the recorded pointing searched by local solving
+    search_radius = 5.0
+    
     def __init__(self):
-        # Initialize astrometry.net client
-        from astroquery.astrometry_net import AstrometryNet
-        self.ast = AstrometryNet()
+        # astrometry.net client, created on first solve
+        self._ast = None
         
-        # Set API key if available
-        api_key = os.environ.get('ASTROMETRY_NET_API_KEY')
-        if api_key:
-            self.ast.api_key = api_key
+    @property
+    def ast(self):
+        """astrometry.net client"""
+        if self._ast is None:
+            # astroquery is a heavy import, so only pay for it when solving
+            from astroquery.astrometry_net import AstrometryNet
+            ast = AstrometryNet()
             
-    def solve_field(self, filepath: str) -> Optional[Dict[str, Any]]:
+            # Set API key if available
+            api_key = os.environ.get('ASTROMETRY_NET_API_KEY')
+            if api_key:
+                ast.api_key = api_key
+            self._ast = ast
+        return self._ast
+        
+    def solve_field(self, filepath: str, include_wcs: bool = False) -> Optional[Dict[str, Any]]:
         """
         Solve plate for image
-        Returns WCS solution if successful
+        Returns center coordinates if successful, with the WCS solution
+        when include_wcs is set
         """
         try:
             # Try online solving first
             if self.ast.api_key:
-                return self._solve_online(filepath)
+                return self._solve_online(filepath, include_wcs)
             
             # Fall back to local solving
-            return self._solve_local(filepath)
+            return self._solve_local(filepath, include_wcs)
             
         except Exception as e:
-            logger.error(f"Plate solving failed: {e}")
+            logger.error("Plate solving failed: %s", e)
             return None
             
-    def _solve_online(self, filepath: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _center_from_wcs(wcs: WCS, wcs_header: fits.Header,
+                         image_header: fits.Header) -> Tuple[float, float]:
+        """Get the RA/Dec of the image center in degrees"""
+        # Solution files carry no data (NAXIS=0), so the image size comes
+        # from solve-field's IMAGEW/IMAGEH or else from the solved image
+        if wcs.pixel_shape is not None:
+            nx, ny = wcs.pixel_shape
+        elif 'IMAGEW' in wcs_header and 'IMAGEH' in wcs_header:
+            nx, ny = wcs_header['IMAGEW'], wcs_header['IMAGEH']
+        else:
+            nx, ny = image_header['NAXIS1'], image_header['NAXIS2']
+            
+        # Plain pixel-to-world transform, without building a SkyCoord
+        ra, dec = wcs.wcs_pix2world(np.array([[(nx - 1) / 2, (ny - 1) / 2]]), 0)[0]
+        return float(ra), float(dec)
+        
+    def _solve_online(self, filepath: str, include_wcs: bool = False) -> Optional[Dict[str, Any]]:
         """Solve using astrometry.net web service"""
         try:
             # Submit image for solving
             wcs_header = self.ast.solve_from_image(filepath)
             
             if wcs_header:
-                # Create WCS object
                 wcs = WCS(wcs_header)
-                
-                # Get center coordinates
-                center = wcs.pixel_to_world(
-                    wcs.pixel_shape[0]/2,
-                    wcs.pixel_shape[1]/2
+                ra, dec = self._center_from_wcs(
+                    wcs, wcs_header, fits.getheader(filepath)
                 )
                 
-                return {
-                    'ra': center.ra.deg,
-                    'dec': center.dec.deg,
-                    'wcs': wcs,
-                    'header': wcs_header
-                }
+                solution = {'ra': ra, 'dec': dec}
+                if include_wcs:
+                    solution['wcs'] = wcs
+                    solution['header'] = wcs_header
+                return solution
                 
         except Exception as e:
-            logger.error(f"Online plate solving failed: {e}")
+            logger.error("Online plate solving failed: %s", e)
             
         return None
         
-    def _solve_local(self, filepath: str) -> Optional[Dict[str, Any]]:
+    def _solve_local(self, filepath: str, include_wcs: bool = False) -> Optional[Dict[str, Any]]:
         """Solve using local installation"""
         try:
-            import subprocess
-            
             # Run solve-field
             cmd = [
                 'solve-field',
                 '--no-plots',
                 '--no-verify',
                 '--resort',
-                '--downsample', '2',
-                filepath
+                '--overwrite',
+                '--downsample', '2'
             ]
             
+            # Search only around the pointing recorded in the image, so
+            # solve-field loads the few index files covering it
+            hdr = fits.getheader(filepath)
+            if 'RA' in hdr and 'DEC' in hdr:
+                cmd += [
+                    '--ra', str(hdr['RA']),
+                    '--dec', str(hdr['DEC']),
+                    '--radius', str(self.search_radius)
+                ]
+            cmd.append(filepath)
+            
             result = subprocess.run(
                 cmd,
                 capture_output=True,
@@ -160,22 +283,17 @@ class PlateSolver:
             if result.returncode == 0:
                 # Load WCS solution
                 wcs_file = filepath.replace('.fits', '.wcs')
-                wcs = WCS(wcs_file)
-                
-                # Get center coordinates
-                center = wcs.pixel_to_world(
-                    wcs.pixel_shape[0]/2,
-                    wcs.pixel_shape[1]/2
-                )
+                wcs_header = fits.getheader(wcs_file)
+                wcs = WCS(wcs_header)
+                ra, dec = self._center_from_wcs(wcs, wcs_header, hdr)
                 
-                return {
-                    'ra': center.ra.deg,
-                    'dec': center.dec.deg,
-                    'wcs': wcs
-                }
+                solution = {'ra': ra, 'dec': dec}
+                if include_wcs:
+                    solution['wcs'] = wcs
+                return solution
                 
         except Exception as e:
-            logger.error(f"Local plate solving failed: {e}")
+            logger.error("Local plate solving failed: %s", e)
             
         return None
 
@@ -210,7 +328,7 @@ class ASCOMBridge:
             self.connected = bool(result)
             return self.connected
         except Exception as e:
-            logger.error(f"ASCOM connect failed: {e}")
+            logger.error("ASCOM connect failed: %s", e)
             return False
             
     def disconnect(self):
@@ -225,6 +343,27 @@ class ASCOMBridge:
         result = self.api.send_command("get_coordinates", {})
         return float(result['ra']), float(result['dec'])
         
+    def get_status(self) -> Optional[Dict[str, Any]]:
+        """
+        Get coordinates and tracking state in one round-trip
+
+        Returns:
+            Status dict, or None if the device didn't return coordinates
+        """
+        coords, tracking = self.api.send_batch([
+            ("get_coordinates", {}),
+            ("get_tracking", {})
+        ])
+        # Failed requests in a batch come back as None
+        if not coords:
+            logger.error("ASCOM status failed: no coordinates returned")
+            return None
+        return {
+            'ra': float(coords['ra']),
+            'dec': float(coords['dec']),
+            'tracking': bool(tracking and tracking.get('enabled'))
+        }
+        
     def slew_to_coordinates(self, ra: float, dec: float) -> bool:
         """Slew to coordinates"""
         result = self.api.send_command(
@@ -273,10 +412,18 @@ class IntegrationManager:
         self.plate_solver = PlateSolver()
         self.ascom_bridge = ASCOMBridge(api)
         
+    def close(self):
+        """Flush pending image writes"""
+        self.fits_handler.close()
+        
     def save_image(self, data: np.ndarray, header: FITSHeader) -> str:
         """Save image as FITS file"""
         return self.fits_handler.save_fits(data, header)
         
+    def save_image_async(self, data: np.ndarray, header: FITSHeader) -> Future:
+        """Save image as FITS file without waiting for the disk write"""
+        return self.fits_handler.save_fits_async(data, header)
+        
     def solve_and_sync(self, filepath: str) -> bool:
         """
         Solve plate and sync mount position
@@ -295,14 +442,14 @@ class IntegrationManager:
             )
             
         except Exception as e:
-            logger.error(f"Solve and sync failed: {e}")
+            logger.error("Solve and sync failed: %s", e)
             return False
             
     def get_image_coordinates(self, filepath: str) -> Optional[SkyCoord]:
         """Get coordinates from image"""
         try:
-            # Load FITS file
-            data, header = self.fits_handler.load_fits(filepath)
+            # Only the header is needed, so leave the image data on disk
+            header = self.fits_handler.load_fits_header(filepath)
             
             # Create SkyCoord object
             coords = SkyCoord(
@@ -313,5 +460,5 @@ class IntegrationManager:
             return coords
             
         except Exception as e:
-            logger.error(f"Failed to get image coordinates: {e}")
+            logger.error("Failed to get image coordinates: %s", e)
             return None
@@ -5,9 +5,52 @@ Logging configuration for Seestar INDI driver
 """
 
 import logging
+import atexit
 import logging.handlers
 import os
+import queue
+import threading
 from pathlib import Path
+from typing import Dict, Tuple
+
+# Loggers already configured by get_logger
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+_LOGGER_LOCK = threading.Lock()
+
+class _QueueRouter(logging.Handler):
+    """Pass each queued record to the handlers of the logger that queued it"""
+    
+    def __init__(self):
+        super().__init__()
+        self.routes: Dict[str, Tuple[logging.Handler, ...]] = {}
+        
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self.routes.get(record.seestar_route, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+        
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+class _RoutedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that tags records with the logger it is attached to"""
+    
+    def __init__(self, log_queue: queue.SimpleQueue, route: str):
+        super().__init__(log_queue)
+        self.route = route
+        
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record.seestar_route = self.route
+        return record
+
+# One background thread writes the console and file output of every logger
+_LOG_QUEUE = queue.SimpleQueue()
+_ROUTER = _QueueRouter()
+_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _ROUTER)
+_LISTENER.start()
+atexit.register(_LISTENER.stop)
 
 def setup_logging(name: str, level: str = "INFO", log_dir: str = None) -> logging.Logger:
     """
@@ -37,7 +80,6 @@ def setup_logging(name: str, level: str = "INFO", log_dir: str = None) -> loggin
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # File handler
     if log_dir is None:
@@ -54,7 +96,10 @@ def setup_logging(name: str, level: str = "INFO", log_dir: str = None) -> loggin
         backupCount=5
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    
+    # Hand records to the background thread so callers never block on I/O
+    _ROUTER.routes[name] = (console_handler, file_handler)
+    logger.addHandler(_RoutedQueueHandler(_LOG_QUEUE, name))
     
     return logger
 
@@ -68,13 +113,20 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         Logger instance
     """
-    logger = logging.getLogger(name)
-    
-    # Only configure if logger doesn't have handlers
-    if not logger.handlers:
-        # Get log level from environment or default to INFO
-        level = os.environ.get("SEESTAR_LOG_LEVEL", "INFO")
-        log_dir = os.environ.get("SEESTAR_LOG_DIR")
-        logger = setup_logging(name, level, log_dir)
+    logger = _LOGGER_CACHE.get(name)
+    if logger is not None:
+        return logger
+        
+    with _LOGGER_LOCK:
+        logger = logging.getLogger(name)
+        
+        # Only configure if logger doesn't have handlers
+        if not logger.handlers:
+            # Get log level from environment or default to INFO
+            level = os.environ.get("SEESTAR_LOG_LEVEL", "INFO")
+            log_dir = os.environ.get("SEESTAR_LOG_DIR")
+            logger = setup_logging(name, level, log_dir)
+            
+        _LOGGER_CACHE[name] = logger
         
     return logger
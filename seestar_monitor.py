@@ -5,67 +5,165 @@ Status monitoring system for Seestar telescope
 Handles device state tracking and event notifications
 """
 
+import sys
 import threading
 import time
 import logging
-from typing import Dict, Any, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, Tuple
 from queue import Queue
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
 from seestar_api import SeestarAPI
 
-@dataclass
-class DeviceState:
-    """Current state of a device"""
-    connected: bool = False
-    error: Optional[str] = None
-    last_update: float = 0.0
-    
-    # Mount state
+# State is only ever read and written by field name; drop the per-instance
+# __dict__ where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
+class MountSnap:
+    """Mount state, updated on every poll"""
     ra: float = 0.0
     dec: float = 0.0
     slewing: bool = False
     tracking: bool = True
-    
-    # Camera state
+
+@dataclass(frozen=True, **_SLOTS)
+class ExposureSnap:
+    """Camera exposure state"""
     exposing: bool = False
     exposure_time: float = 0.0
-    exposure_start: float = 0.0
+    exposure_start: float = 0.0  # time.monotonic() when the exposure began
     gain: int = 1
+
+@dataclass(frozen=True, **_SLOTS)
+class FilterSnap:
+    """Filter wheel state"""
+    position: int = 0
+    moving: bool = False
+
+@dataclass(frozen=True, **_SLOTS)
+class FocusSnap:
+    """Focuser state"""
+    position: int = 0
+    moving: bool = False
+    temperature: float = 20.0
+    auto_focusing: bool = False
+
+# Flat DeviceState attribute -> (group, field) of the group snapshot holding it
+_GROUPED_FIELDS = {
+    "ra": ("mount", "ra"),
+    "dec": ("mount", "dec"),
+    "slewing": ("mount", "slewing"),
+    "tracking": ("mount", "tracking"),
+    "exposing": ("exposure", "exposing"),
+    "exposure_time": ("exposure", "exposure_time"),
+    "exposure_start": ("exposure", "exposure_start"),
+    "gain": ("exposure", "gain"),
+    "filter_position": ("filter", "position"),
+    "filter_moving": ("filter", "moving"),
+    "focus_position": ("focus", "position"),
+    "focus_moving": ("focus", "moving"),
+    "focus_temperature": ("focus", "temperature"),
+    "auto_focusing": ("focus", "auto_focusing")
+}
+
+@dataclass(frozen=True, **_SLOTS)
+class DeviceState:
+    """
+    Snapshot of the device state
     
-    # Filter wheel state
-    filter_position: int = 0
-    filter_moving: bool = False
+    Snapshots are immutable: the monitor publishes a new one for every
+    change, so a snapshot read once stays consistent. Mount, exposure,
+    filter and focus state live in separate group snapshots, and a change
+    only rebuilds its own group; the others are shared with the previous
+    snapshot. The flat attributes (ra, focus_position, ...) read through
+    to the groups.
+    """
+    connected: bool = False
+    error: Optional[str] = None
+    last_update: float = 0.0
     
-    # Focuser state
-    focus_position: int = 0
-    focus_moving: bool = False
-    focus_temperature: float = 20.0
-    auto_focusing: bool = False
+    mount: MountSnap = field(default_factory=MountSnap)
+    exposure: ExposureSnap = field(default_factory=ExposureSnap)
+    filter: FilterSnap = field(default_factory=FilterSnap)
+    focus: FocusSnap = field(default_factory=FocusSnap)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Flat dict of the state, keyed by the flat attribute names"""
+        return {name: getattr(self, name) for name in _FLAT_FIELDS}
+
+for _name, (_group, _field) in _GROUPED_FIELDS.items():
+    setattr(DeviceState, _name, property(attrgetter(f"{_group}.{_field}")))
+
+_FLAT_FIELDS = ("connected", "error", "last_update", *_GROUPED_FIELDS)
+
+def _evolve(state: DeviceState, changes: Dict[str, Any]) -> DeviceState:
+    """New snapshot with flat attribute changes applied"""
+    top = {}
+    groups: Dict[str, Dict[str, Any]] = {}
+    for key, value in changes.items():
+        grouped = _GROUPED_FIELDS.get(key)
+        if grouped is None:
+            top[key] = value
+        else:
+            groups.setdefault(grouped[0], {})[grouped[1]] = value
+    for group, values in groups.items():
+        top[group] = replace(getattr(state, group), **values)
+    return replace(state, **top)
 
 class DeviceMonitor:
     def __init__(self, api: SeestarAPI):
         self.logger = logging.getLogger("SeestarMonitor")
         self.api = api
         
-        # Device state
+        # Device state, replaced on every change; state_lock serializes writers
         self.state = DeviceState()
         self.state_lock = threading.Lock()
         
-        # Event handling
+        # Completion signals, set when the operation's busy flag clears
+        self.exposure_done = threading.Event()
+        self.autofocus_done = threading.Event()
+        self._done_events = {
+            "exposing": self.exposure_done,
+            "auto_focusing": self.autofocus_done
+        }
+        
+        # Event handling; each queue item is the list of events from one update
         self.event_queue: Queue = Queue()
-        self.event_callbacks: Dict[str, list[Callable]] = {}
+        # Callback tuples are replaced on registration, so dispatch needs no lock
+        self.event_callbacks: Dict[str, Tuple[Callable, ...]] = {}
+        self._callback_lock = threading.Lock()
+        # Generic plus per-property callbacks for each state_change property,
+        # filled in by the event thread and replaced on every registration
+        self._state_dispatch: Dict[str, Tuple[Callable, ...]] = {}
         
         # Monitoring threads
         self.monitor_thread: Optional[threading.Thread] = None
         self.event_thread: Optional[threading.Thread] = None
         self.running = False
         
+        # Workers for overlapping the independent status queries
+        self._poll_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Adaptive polling: fast while the device is busy or changing,
+        # slow when nothing has changed for a while
+        self.poll_interval = 0.5  # seconds
+        self.idle_poll_interval = 2.0  # seconds
+        self.idle_after = 5.0  # seconds without a state change
+        self._last_change = 0.0
+        self._wake = threading.Event()
+        
     def start(self):
         """Start monitoring threads"""
         if self.running:
             return
             
         self.running = True
+        self._poll_executor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="SeestarPoll"
+        )
         
         # Start monitor thread
         self.monitor_thread = threading.Thread(
@@ -86,72 +184,105 @@ class DeviceMonitor:
     def stop(self):
         """Stop monitoring threads"""
         self.running = False
+        self._wake.set()
         if self.monitor_thread:
             self.monitor_thread.join()
         if self.event_thread:
+            self.event_queue.put(None)  # Wake the event thread so it exits
             self.event_thread.join()
+            self.event_thread = None
+        if self._poll_executor:
+            self._poll_executor.shutdown(wait=False)
+            self._poll_executor = None
             
     def add_event_callback(self, event_type: str, callback: Callable):
-        """Add callback for specific event type"""
-        if event_type not in self.event_callbacks:
-            self.event_callbacks[event_type] = []
-        self.event_callbacks[event_type].append(callback)
+        """
+        Add callback for specific event type
+        
+        Besides "state_change" and "exposure_complete", event_type may be a
+        DeviceState attribute name, to receive only that attribute's
+        state_change events.
+        """
+        with self._callback_lock:
+            callbacks = self.event_callbacks.get(event_type, ())
+            self.event_callbacks[event_type] = callbacks + (callback,)
+            self._state_dispatch = {}
         
     def remove_event_callback(self, event_type: str, callback: Callable):
         """Remove callback for specific event type"""
-        if event_type in self.event_callbacks:
-            self.event_callbacks[event_type].remove(callback)
+        with self._callback_lock:
+            callbacks = list(self.event_callbacks.get(event_type, ()))
+            if callback in callbacks:
+                callbacks.remove(callback)
+                self.event_callbacks[event_type] = tuple(callbacks)
+                self._state_dispatch = {}
             
     def _update_state(self, updates: Dict[str, Any]):
         """Update device state with new values"""
         with self.state_lock:
-            for key, value in updates.items():
-                if hasattr(self.state, key):
-                    old_value = getattr(self.state, key)
-                    if old_value != value:
-                        setattr(self.state, key, value)
-                        # Queue state change event
-                        self.event_queue.put({
-                            "type": "state_change",
-                            "property": key,
-                            "old_value": old_value,
-                            "new_value": value
-                        })
-                        
+            self._apply(updates)
+            
+    def _update_mount(self, ra: float, dec: float):
+        """Record a successful coordinate poll"""
+        with self.state_lock:
+            state = self.state
+            if state.ra == ra and state.dec == dec and state.connected and state.error is None:
+                return
+            self._apply({"ra": ra, "dec": dec, "connected": True, "error": None})
+            
+    def _apply(self, updates: Dict[str, Any]):
+        """Publish a new state snapshot and queue its change events; needs state_lock"""
+        old = self.state
+        changed = {key: value for key, value in updates.items() if getattr(old, key) != value}
+        if changed:
+            self.state = _evolve(old, changed)
+            self._last_change = time.monotonic()
+            
+            # Queue the change events of one update together
+            events = []
+            for key, value in changed.items():
+                if not value and key in self._done_events:
+                    self._done_events[key].set()
+                events.append({
+                    "type": "state_change",
+                    "property": key,
+                    "old_value": getattr(old, key),
+                    "new_value": value
+                })
+            self.event_queue.put(events)
+            
     def _monitor_loop(self):
         """Main monitoring loop"""
         while self.running:
             try:
+                # Query coordinates, slew state and temperature with as few
+                # round-trips as possible
+                coords, slewing, temp = self._poll_status()
+                
                 # Update mount status
-                coords = self.api.get_coordinates()
                 if coords:
-                    self._update_state({
-                        "ra": coords.get("ra", 0.0),
-                        "dec": coords.get("dec", 0.0),
-                        "connected": True,
-                        "error": None
-                    })
+                    self._update_mount(coords.get("ra", 0.0), coords.get("dec", 0.0))
                     
                 # Check if slewing
-                slewing = self.api.is_slewing()
                 self._update_state({"slewing": slewing})
                 
                 # Update temperature
-                temp = self.api.get_temperature()
                 if temp is not None:
                     self._update_state({"focus_temperature": temp})
                     
                 # Update exposure status if exposing
-                if self.state.exposing:
-                    elapsed = time.time() - self.state.exposure_start
-                    if elapsed >= self.state.exposure_time:
+                state = self.state
+                if state.exposing:
+                    elapsed = time.monotonic() - state.exposure_start
+                    if elapsed >= state.exposure_time:
                         self._update_state({"exposing": False})
-                        self.event_queue.put({
+                        self.event_queue.put([{
                             "type": "exposure_complete"
-                        })
+                        }])
                         
-                # Brief delay between updates
-                time.sleep(0.5)
+                # Delay until the next update unless a command wakes us
+                self._wake.wait(self._next_poll_interval())
+                self._wake.clear()
                 
             except Exception as e:
                 self.logger.error(f"Monitor error: {str(e)}")
@@ -159,42 +290,89 @@ class DeviceMonitor:
                     "connected": False,
                     "error": str(e)
                 })
-                time.sleep(5)  # Longer delay after error
+                self._wake.wait(5)  # Longer delay after error
+                self._wake.clear()
+                
+    def _next_poll_interval(self) -> float:
+        """Get delay before the next poll based on device activity"""
+        # Only flags the poll keeps current count as busy: the focuser and
+        # filter flags are set by commands but never read back, so they
+        # would hold the fast interval forever
+        state = self.state
+        busy = state.slewing or state.exposing
+        if busy or time.monotonic() - self._last_change < self.idle_after:
+            return self.poll_interval
+        return self.idle_poll_interval
                 
+    def _poll_status(self):
+        """Fetch coordinates, slew state and temperature"""
+        # Temperature comes from the device state, which also refreshes the
+        # cached coordinates and view state when the telescope reports them
+        temp = self.api.get_temperature()
+        
+        # Query whatever is still missing in parallel
+        futures = [
+            self._poll_executor.submit(query)
+            for query in (self.api.get_coordinates, self.api.is_slewing)
+        ]
+        coords, slewing = (future.result() for future in futures)
+        return coords, slewing, temp
+        
     def _event_loop(self):
         """Event processing loop"""
-        while self.running:
-            try:
-                # Get next event
-                event = self.event_queue.get(timeout=1.0)
+        while True:
+            # Block until the next events; stop() queues None to end the loop
+            events = self.event_queue.get()
+            if events is None:
+                break
                 
-                # Call registered callbacks
-                event_type = event["type"]
-                if event_type in self.event_callbacks:
-                    for callback in self.event_callbacks[event_type]:
+            for event in events:
+                try:
+                    # Call registered callbacks
+                    if event["type"] == "state_change":
+                        callbacks = self._state_callbacks(event["property"])
+                    else:
+                        callbacks = self.event_callbacks.get(event["type"], ())
+                    for callback in callbacks:
                         try:
                             callback(event)
                         except Exception as e:
                             self.logger.error(f"Event callback error: {str(e)}")
                             
-            except Exception as e:
-                if self.running:  # Only log if not shutting down
-                    self.logger.error(f"Event processing error: {str(e)}")
+                except Exception as e:
+                    if self.running:  # Only log if not shutting down
+                        self.logger.error(f"Event processing error: {str(e)}")
                     
+    def _state_callbacks(self, prop: str) -> Tuple[Callable, ...]:
+        """Get the callbacks for a state_change event of one property"""
+        # Take the cache before reading the registrations, so a concurrent
+        # registration only ever discards what is computed here
+        dispatch = self._state_dispatch
+        callbacks = dispatch.get(prop)
+        if callbacks is None:
+            callbacks = (
+                self.event_callbacks.get("state_change", ()) +
+                self.event_callbacks.get(prop, ())
+            )
+            dispatch[prop] = callbacks
+        return callbacks
+        
     def get_state(self) -> DeviceState:
         """Get current device state"""
-        with self.state_lock:
-            return self.state
+        # Snapshots are immutable and swapped in whole, so no lock is needed
+        return self.state
             
     def start_exposure(self, duration: float, gain: int = 1) -> bool:
         """Start camera exposure"""
+        self.exposure_done.clear()
         if self.api.start_exposure(duration, gain):
             self._update_state({
                 "exposing": True,
                 "exposure_time": duration,
-                "exposure_start": time.time(),
+                "exposure_start": time.monotonic(),
                 "gain": gain
             })
+            self._wake.set()  # Resume fast polling right away
             return True
         return False
         
@@ -204,15 +382,18 @@ class DeviceMonitor:
             self._update_state({
                 "exposing": False
             })
+            self._wake.set()
             return True
         return False
         
     def start_autofocus(self) -> bool:
         """Start auto focus sequence"""
+        self.autofocus_done.clear()
         if self.api.start_autofocus():
             self._update_state({
                 "auto_focusing": True
             })
+            self._wake.set()
             return True
         return False
         
@@ -223,5 +404,6 @@ class DeviceMonitor:
                 "filter_position": position,
                 "filter_moving": True
             })
+            self._wake.set()
             return True
         return False
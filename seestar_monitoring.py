@@ -11,7 +11,10 @@ import cProfile
 import pstats
 import io
 import threading
-from typing import Any, Dict, List, Optional
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from prometheus_client import (
@@ -19,6 +22,11 @@ from prometheus_client import (
     start_http_server as start_metrics_server
 )
 
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # pyinstrument is optional
+    SamplingProfiler = None
+
 from seestar_logging import get_logger
 from seestar_config import config_manager
 
@@ -86,6 +94,29 @@ METRICS = {
     )
 }
 
+# Bound once so the update loop doesn't look each metric up by name
+_DEVICE_TEMPERATURE = METRICS['device_temperature_celsius']
+_DEVICE_FOCUS_POSITION = METRICS['device_focus_position']
+_DEVICE_FILTER_POSITION = METRICS['device_filter_position']
+_CACHE_HITS = METRICS['cache_hits_total']
+_CACHE_MISSES = METRICS['cache_misses_total']
+_BATCH_SIZE = METRICS['batch_size']
+_CPU_USAGE = METRICS['cpu_usage_percent']
+_MEMORY_USAGE = METRICS['memory_usage_bytes']
+_DISK_USAGE = METRICS['disk_usage_percent']
+
+@functools.lru_cache(maxsize=1)
+def _sample_system_usage(second: int) -> Tuple[float, Any, Any]:
+    """CPU percent, memory and root disk usage for the given second"""
+    return psutil.cpu_percent(), psutil.virtual_memory(), psutil.disk_usage('/')
+
+def _system_usage() -> Tuple[float, Any, Any]:
+    """Current system usage, sampled at most once a second"""
+    return _sample_system_usage(int(time.monotonic()))
+
+# Health statuses from worst to best
+_STATUS_RANK = {"unhealthy": 0, "degraded": 1, "healthy": 2}
+
 @dataclass
 class HealthStatus:
     """Health check status"""
@@ -94,39 +125,49 @@ class HealthStatus:
     details: Dict[str, Any]
     timestamp: datetime
 
+def _status_rank(status: HealthStatus) -> int:
+    """Sort key putting the worst health status first"""
+    return _STATUS_RANK[status.status]
+
 class HealthChecker:
     """System health checker"""
     def __init__(self, api, monitor, performance_optimizer):
         self.api = api
         self.monitor = monitor
         self.optimizer = performance_optimizer
-        self.health_history: List[HealthStatus] = []
         self.max_history = 100
+        self.health_history: Deque[HealthStatus] = deque(maxlen=self.max_history)
+        
+        # The API check waits on a network round-trip, so the checks run
+        # side by side rather than queueing behind it
+        self._checks = {
+            "api": self._check_api_health,
+            "device": self._check_device_health,
+            "performance": self._check_performance_health,
+            "system": self._check_system_health
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._checks),
+            thread_name_prefix="HealthCheck"
+        )
         
     def check_health(self) -> Dict[str, HealthStatus]:
         """Perform health checks on all components"""
-        checks = {
-            "api": self._check_api_health(),
-            "device": self._check_device_health(),
-            "performance": self._check_performance_health(),
-            "system": self._check_system_health()
-        }
+        results = self._executor.map(lambda check: check(), self._checks.values())
+        checks = dict(zip(self._checks, results))
+        
+        # Update history; the deque drops the oldest entries itself
+        self.health_history.extend(checks.values())
         
-        # Update history
-        for status in checks.values():
-            self.health_history.append(status)
-            if len(self.health_history) > self.max_history:
-                self.health_history.pop(0)
-                
         return checks
         
     def _check_api_health(self) -> HealthStatus:
         """Check API health"""
         try:
             # Test API connection
-            start = time.time()
+            start = time.monotonic()
             result = self.api.send_command("test_connection", {})
-            response_time = time.time() - start
+            response_time = time.monotonic() - start
             
             status = "healthy"
             details = {
@@ -184,9 +225,7 @@ class HealthChecker:
         
     def _check_system_health(self) -> HealthStatus:
         """Check system health"""
-        cpu_percent = psutil.cpu_percent()
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        cpu_percent, memory, disk = _system_usage()
         
         status = "healthy"
         details = {
@@ -202,46 +241,54 @@ class HealthChecker:
         return HealthStatus("system", status, details, datetime.now())
 
 class PerformanceProfiler:
-    """System performance profiler"""
-    def __init__(self):
-        self.profiler = cProfile.Profile()
+    """
+    System performance profiler
+    
+    Samples the stack with pyinstrument when it is installed, which costs
+    far less than instrumenting every call; falls back to cProfile.
+    """
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval  # seconds between samples
+        self.profiler = None
         self.active = False
-        self.profiles: Dict[str, pstats.Stats] = {}
+        self.profiles: Dict[str, str] = {}
         
     def start_profiling(self, name: str):
         """Start profiling session"""
         if self.active:
             return
             
+        if SamplingProfiler is not None:
+            self.profiler = SamplingProfiler(interval=self.interval)
+            self.profiler.start()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
         self.active = True
-        self.profiler.enable()
         
     def stop_profiling(self, name: str):
         """Stop profiling session and save results"""
         if not self.active:
             return
             
-        self.profiler.disable()
-        self.active = False
-        
+        if SamplingProfiler is not None:
+            self.profiler.stop()
+            report = self.profiler.output_text()
+        else:
+            self.profiler.disable()
+            s = io.StringIO()
+            ps = pstats.Stats(self.profiler, stream=s).sort_stats('cumulative')
+            ps.print_stats()
+            report = s.getvalue()
+            
         # Save profile
-        s = io.StringIO()
-        ps = pstats.Stats(self.profiler, stream=s).sort_stats('cumulative')
-        ps.print_stats()
-        self.profiles[name] = ps
-        
-        # Clear profiler
-        self.profiler = cProfile.Profile()
+        self.profiles[name] = report
+        self.profiler = None
+        self.active = False
         
     def get_profile(self, name: str) -> Optional[str]:
         """Get profile results"""
-        if name not in self.profiles:
-            return None
-            
-        s = io.StringIO()
-        self.profiles[name].stream = s
-        self.profiles[name].print_stats()
-        return s.getvalue()
+        return self.profiles.get(name)
 
 class MonitoringSystem:
     """Main monitoring system"""
@@ -261,10 +308,17 @@ class MonitoringSystem:
         # Monitoring state
         self.running = False
         self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.update_interval = 5.0  # seconds
+        
+        # Cache totals already exported; the optimizer reports cumulative counts
+        self._last_hits = 0
+        self._last_misses = 0
         
     def start(self, metrics_port: int = 9090):
         """Start monitoring system"""
         self.running = True
+        self._stop_event.clear()
         
         # Start metrics server
         start_metrics_server(metrics_port)
@@ -281,6 +335,7 @@ class MonitoringSystem:
     def stop(self):
         """Stop monitoring system"""
         self.running = False
+        self._stop_event.set()  # Wake the monitoring thread so it exits
         
     def _monitor_loop(self):
         """Main monitoring loop"""
@@ -295,37 +350,46 @@ class MonitoringSystem:
                 # Log issues
                 self._log_health_issues(health)
                 
-                # Wait before next update
-                time.sleep(5)
-                
             except Exception as e:
                 logger.error(f"Monitoring error: {e}")
-                time.sleep(5)
+                
+            # Wait before next update unless stopped
+            self._stop_event.wait(self.update_interval)
                 
     def _update_metrics(self):
         """Update all metrics"""
         try:
             # Update device metrics
             state = self.device_monitor.get_state()
-            METRICS['device_temperature_celsius'].set(state.focus_temperature)
-            METRICS['device_focus_position'].set(state.focus_position)
-            METRICS['device_filter_position'].set(state.filter_position)
+            _DEVICE_TEMPERATURE.set(state.focus_temperature)
+            _DEVICE_FOCUS_POSITION.set(state.focus_position)
+            _DEVICE_FILTER_POSITION.set(state.filter_position)
             
             # Update performance metrics
             stats = self.optimizer.get_performance_stats()
             cache_stats = stats["cache_stats"]
-            METRICS['cache_hits_total'].inc(cache_stats["hits"])
-            METRICS['cache_misses_total'].inc(cache_stats["misses"])
-            METRICS['batch_size'].observe(stats["current_batch_size"])
+            hits = cache_stats["hits"]
+            misses = cache_stats["misses"]
+            # Only add what's new since the last tick; a cache clear resets
+            # the totals, so start counting again from zero
+            if hits < self._last_hits:
+                self._last_hits = 0
+            if misses < self._last_misses:
+                self._last_misses = 0
+            if hits > self._last_hits:
+                _CACHE_HITS.inc(hits - self._last_hits)
+            if misses > self._last_misses:
+                _CACHE_MISSES.inc(misses - self._last_misses)
+            self._last_hits = hits
+            self._last_misses = misses
+            _BATCH_SIZE.observe(stats["current_batch_size"])
             
             # Update system metrics
-            cpu_percent = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            cpu_percent, memory, disk = _system_usage()
             
-            METRICS['cpu_usage_percent'].set(cpu_percent)
-            METRICS['memory_usage_bytes'].set(memory.used)
-            METRICS['disk_usage_percent'].set(disk.percent)
+            _CPU_USAGE.set(cpu_percent)
+            _MEMORY_USAGE.set(memory.used)
+            _DISK_USAGE.set(disk.percent)
             
         except Exception as e:
             logger.error(f"Error updating metrics: {e}")
@@ -351,10 +415,11 @@ class MonitoringSystem:
     def get_health_report(self) -> Dict[str, Any]:
         """Get complete health report"""
         health = self.health_checker.check_health()
+        cpu_percent, memory, disk = _system_usage()
         
         return {
             "timestamp": datetime.now().isoformat(),
-            "overall_status": min(s.status for s in health.values()),
+            "overall_status": min(health.values(), key=_status_rank).status,
             "components": {
                 name: {
                     "status": status.status,
@@ -363,8 +428,8 @@ class MonitoringSystem:
                 for name, status in health.items()
             },
             "metrics": {
-                "cpu_usage": psutil.cpu_percent(),
-                "memory_usage": psutil.virtual_memory().percent,
-                "disk_usage": psutil.disk_usage('/').percent
+                "cpu_usage": cpu_percent,
+                "memory_usage": memory.percent,
+                "disk_usage": disk.percent
             }
         }
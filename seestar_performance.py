@@ -6,29 +6,46 @@ Handles connection pooling, request batching, and caching
 """
 
 import time
-import gzip
-import json
-import queue
+import zlib
 import threading
-import requests
-from typing import Any, Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from urllib3 import PoolManager, HTTPConnectionPool
+from urllib3 import PoolManager
+from urllib3.response import HTTPResponse
 from cachetools import TTLCache, LRUCache
 
+from seestar_api import _freeze
 from seestar_logging import get_logger
 from seestar_config import config_manager
+from seestar_monitoring import METRICS
 
 logger = get_logger("SeestarPerformance")
 
+_MISSING = object()
+
+def _readback_key(method: str) -> Callable[[Dict[str, Any]], Hashable]:
+    """
+    Cache key encoder for a status readback method
+    
+    Readbacks are polled without parameters, so the method name alone is
+    the key; parameters, when given, are frozen into the key.
+    """
+    def encode(params: Dict[str, Any]) -> Hashable:
+        if not params:
+            return method
+        return (method, _freeze(params))
+    return encode
+
 @dataclass
 class BatchRequest:
     """Batch request container"""
     method: str
     params: Dict[str, Any]
     callback: Optional[callable] = None
-    timestamp: float = time.time()
+    timestamp: float = field(default_factory=time.monotonic)
 
 class ConnectionPool:
     """Connection pool for API requests"""
@@ -40,21 +57,21 @@ class ConnectionPool:
             retries=False,  # We handle retries separately
             timeout=5.0
         )
-        self.connection_pool = HTTPConnectionPool(
-            host=host,
-            port=port,
-            maxsize=max_size,
-            retries=False
-        )
+        # The manager's own pool for the device; no separate pool is needed
+        self.connection_pool = self.pool.connection_from_host(host, port)
+        
+    def request(self, method: str, url: str, **kwargs) -> HTTPResponse:
+        """
+        Make request using connection pool
         
-    def request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """Make request using connection pool"""
+        Returns urllib3's response; pass preload_content=False to stream
+        the body with stream() instead of reading it all up front.
+        """
         return self.pool.request(method, url, **kwargs)
         
     def close(self):
         """Close connection pool"""
         self.pool.clear()
-        self.connection_pool.close()
 
 class RequestBatcher:
     """Batches requests for efficient processing"""
@@ -62,9 +79,12 @@ class RequestBatcher:
         self.api = api
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout
-        self.batch_queue: queue.Queue = queue.Queue()
+        # Requests from any thread, drained by the batch thread; deque appends
+        # and pops are atomic, so only the wakeup needs an Event
+        self.batch_queue: Deque[BatchRequest] = deque()
+        self._wakeup = threading.Event()
         self.current_batch: List[BatchRequest] = []
-        self.last_batch_time = time.time()
+        self.last_batch_time = time.monotonic()
         self.running = False
         self._lock = threading.Lock()
         
@@ -79,41 +99,67 @@ class RequestBatcher:
         
     def stop(self):
         """Stop request batching"""
+        if not self.running:
+            return
         self.running = False
+        self._wakeup.set()  # Wake the batch thread so it exits
         
     def add_request(self, request: BatchRequest):
         """Add request to batch queue"""
-        self.batch_queue.put(request)
+        self.batch_queue.append(request)
+        self._wakeup.set()
         
     def _process_batches(self):
         """Process batched requests"""
-        while self.running:
-            try:
-                # Get next request
-                request = self.batch_queue.get(timeout=self.batch_timeout)
-                
+        deadline = None  # When the pending partial batch must be sent
+        while True:
+            # Sleep until requests arrive; only wait with a timeout while a
+            # partial batch is pending
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+            
+            # Take everything queued since the last wakeup in one pass
+            while self.batch_queue:
+                request = self.batch_queue.popleft()
                 with self._lock:
                     self.current_batch.append(request)
-                    
-                    # Check if we should process batch
-                    should_process = (
-                        len(self.current_batch) >= self.batch_size or
-                        time.time() - self.last_batch_time >= self.batch_timeout
-                    )
-                    
-                if should_process:
+                    full = len(self.current_batch) >= self.batch_size
+                if full:
                     self._send_batch()
                     
-            except queue.Empty:
+            # Send whatever is still pending and exit once stopped
+            if not self.running:
+                self._send_batch()
+                break
+                
+            if not self.current_batch:
+                deadline = None
+            elif deadline is None:
+                deadline = time.monotonic() + self.batch_timeout
+            elif time.monotonic() >= deadline:
                 # Process partial batch on timeout
-                with self._lock:
-                    if self.current_batch:
-                        self._send_batch()
-                        
+                self._send_batch()
+                deadline = None
+                
     def _send_batch(self):
         """Send batch of requests"""
         with self._lock:
-            if not self.current_batch:
+            batch = self.current_batch
+            if not batch:
+                return
+                
+            # Clear current batch
+            self.current_batch = []
+            self.last_batch_time = time.monotonic()
+            
+        try:
+            # Most batches hold a single request; send it as a plain command
+            if len(batch) == 1:
+                request = batch[0]
+                response = self.api.send_command(request.method, request.params)
+                if request.callback:
+                    request.callback(response)
                 return
                 
             # Prepare batch request
@@ -123,35 +169,31 @@ class RequestBatcher:
                         "method": req.method,
                         "params": req.params
                     }
-                    for req in self.current_batch
+                    for req in batch
                 ]
             }
             
-            # Store callbacks
-            callbacks = [req.callback for req in self.current_batch]
-            
-            # Clear current batch
-            self.current_batch = []
-            self.last_batch_time = time.time()
-            
-        try:
             # Send batch request
             response = self.api.send_command("batch", batch_params)
             
             # Handle responses
             if response and "results" in response:
-                for callback, result in zip(callbacks, response["results"]):
-                    if callback:
-                        callback(result)
+                for req, result in zip(batch, response["results"]):
+                    if req.callback:
+                        req.callback(result)
                         
         except Exception as e:
             logger.error(f"Batch request failed: {e}")
 
 class ResponseCompressor:
     """Handles response compression"""
-    def __init__(self, compression_threshold: int = 1024):
+    def __init__(self, compression_threshold: int = 1024, level: int = 1):
         self.compression_threshold = compression_threshold
         
+        # Configured gzip-format deflate stream, copied for each message
+        # instead of setting up a new compressor every time
+        self._gzip_template = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        
     def compress(self, data: bytes) -> Tuple[bytes, bool]:
         """
         Compress data if beneficial
@@ -160,8 +202,14 @@ class ResponseCompressor:
         if len(data) < self.compression_threshold:
             return data, False
             
+        # 256 random bytes (compressed or encrypted data) hold ~160 distinct
+        # values, JSON text well under 100, so probe a prefix before deflating
+        if len(set(data[:256])) > 128:
+            return data, False
+            
         try:
-            compressed = gzip.compress(data)
+            compressor = self._gzip_template.copy()
+            compressed = compressor.compress(data) + compressor.flush()
             if len(compressed) < len(data):
                 return compressed, True
         except Exception as e:
@@ -175,7 +223,7 @@ class ResponseCompressor:
             return data
             
         try:
-            return gzip.decompress(data)
+            return zlib.decompress(data, 16 + zlib.MAX_WBITS)
         except Exception as e:
             logger.error(f"Decompression failed: {e}")
             return data
@@ -194,12 +242,15 @@ class CacheManager:
             maxsize=100  # Maximum 100 items
         )
         
-        # Set of cacheable methods
-        self.cacheable_methods = {
-            "get_coordinates",
-            "get_filter_position",
-            "get_focus_position",
-            "get_temperature"
+        # Cacheable methods and the encoder building each one's cache key
+        self.cacheable_methods: Dict[str, Callable[[Dict[str, Any]], Hashable]] = {
+            method: _readback_key(method)
+            for method in (
+                "get_coordinates",
+                "get_filter_position",
+                "get_focus_position",
+                "get_temperature"
+            )
         }
         
         # Cache statistics
@@ -208,25 +259,25 @@ class CacheManager:
         
     def get_cached_response(self, method: str, params: Dict[str, Any]) -> Optional[Any]:
         """Get cached response if available"""
-        if method not in self.cacheable_methods:
+        encode = self.cacheable_methods.get(method)
+        if encode is None:
             return None
             
-        cache_key = self._make_cache_key(method, params)
-        
-        if cache_key in self.response_cache:
+        response = self.response_cache.get(encode(params), _MISSING)
+        if response is not _MISSING:
             self.hits += 1
-            return self.response_cache[cache_key]
+            return response
             
         self.misses += 1
         return None
         
     def cache_response(self, method: str, params: Dict[str, Any], response: Any):
         """Cache API response"""
-        if method not in self.cacheable_methods:
+        encode = self.cacheable_methods.get(method)
+        if encode is None:
             return
             
-        cache_key = self._make_cache_key(method, params)
-        self.response_cache[cache_key] = response
+        self.response_cache[encode(params)] = response
         
     def cache_static(self, key: str, data: Any):
         """Cache static resource"""
@@ -236,10 +287,6 @@ class CacheManager:
         """Get cached static resource"""
         return self.static_cache.get(key)
         
-    def _make_cache_key(self, method: str, params: Dict[str, Any]) -> str:
-        """Create cache key from method and parameters"""
-        return f"{method}:{json.dumps(params, sort_keys=True)}"
-        
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total = self.hits + self.misses
@@ -275,6 +322,21 @@ class PerformanceOptimizer:
         self.compressor = ResponseCompressor()
         self.cache_manager = CacheManager()
         
+        # Per-method request counters, bound up front so counting a request
+        # is a dict lookup rather than a label resolution
+        self._request_counters = {
+            method: METRICS['api_requests_total'].labels(method=method)
+            for method in self.cache_manager.cacheable_methods
+        }
+        
+        # Readback requests waiting for a response, keyed by method and
+        # parameters; identical readbacks join the pending one instead of
+        # being sent again. Commands are never coalesced: each one must run.
+        self._inflight: Dict[Tuple, Tuple[float, List[Callable]]] = {}
+        self._inflight_lock = threading.Lock()
+        # Pending requests older than this are assumed lost and sent again
+        self.inflight_timeout = config_manager.config.api.timeout
+        
     def start(self):
         """Start performance optimization"""
         self.request_batcher.start()
@@ -287,6 +349,14 @@ class PerformanceOptimizer:
     def send_request(self, method: str, params: Dict[str, Any],
                     callback: Optional[callable] = None) -> Optional[Any]:
         """Send optimized request"""
+        counter = self._request_counters.get(method)
+        if counter is None:
+            counter = self._request_counters.setdefault(
+                method,
+                METRICS['api_requests_total'].labels(method=method)
+            )
+        counter.inc()
+        
         # Check cache first
         cached = self.cache_manager.get_cached_response(method, params)
         if cached is not None:
@@ -294,16 +364,44 @@ class PerformanceOptimizer:
                 callback(cached)
             return cached
             
+        # Commands that change the device are sent every time
+        if method not in self.cache_manager.cacheable_methods:
+            self.request_batcher.add_request(BatchRequest(method, params, callback))
+            return None
+            
+        # Join an identical readback that is still waiting for its response
+        key = (method, _freeze(params))
+        now = time.monotonic()
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is not None and now - pending[0] < self.inflight_timeout:
+                if callback:
+                    pending[1].append(callback)
+                return None
+            waiters = [callback] if callback else []
+            self._inflight[key] = (now, waiters)
+            
         # Create batch request
-        request = BatchRequest(method, params, callback)
+        request = BatchRequest(method, params, partial(self._complete, key, waiters))
         
         # Add to batch queue
         self.request_batcher.add_request(request)
         
+    def _complete(self, key: Tuple, waiters: List[Callable], response: Any):
+        """Deliver a response to every caller waiting on the request"""
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is not None and pending[1] is waiters:
+                del self._inflight[key]
+                
+        for callback in waiters:
+            callback(response)
+            
+        
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
         return {
             "cache_stats": self.cache_manager.get_stats(),
-            "batch_queue_size": self.request_batcher.batch_queue.qsize(),
+            "batch_queue_size": len(self.request_batcher.batch_queue),
             "current_batch_size": len(self.request_batcher.current_batch)
         }
@@ -6,17 +6,20 @@ Handles reconnection, state recovery, and command retries
 """
 
 import time
-import queue
 import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from seestar_logging import get_logger
 from seestar_config import config_manager
 
 logger = get_logger("SeestarRecovery")
 
+# Command priority levels, 0 being the most urgent
+PRIORITY_LEVELS = 4
+
 @dataclass
 class Command:
     """Command to be executed"""
@@ -89,63 +92,137 @@ class CommandQueue:
     """Queue for commands with retry logic"""
     def __init__(self, api):
         self.api = api
-        self.queue: queue.PriorityQueue = queue.PriorityQueue()
+        # One FIFO bin per priority level; deque appends and pops are atomic,
+        # so producers only need the Event to wake the processor
+        self._bins: Tuple[Deque[Command], ...] = tuple(
+            deque() for _ in range(PRIORITY_LEVELS)
+        )
+        self._ready = threading.Event()
+        # Ready commands of one priority taken per wakeup and sent in order;
+        # priority 0 commands are taken one at a time
+        self.batch_max = 32
         self.processing = False
         self.current_transaction = TransactionLog()
         self._lock = threading.Lock()
         
     def start(self):
         """Start command processing"""
+        if self.processing:
+            return
+            
         self.processing = True
+        # Each processor gets its own shutdown event, so a processor still
+        # finishing a command after stop() can't carry on after a restart
+        self._shutdown = threading.Event()
         threading.Thread(
             target=self._process_commands,
+            args=(self._shutdown,),
             name="CommandProcessor",
             daemon=True
         ).start()
         
     def stop(self):
         """Stop command processing"""
+        if not self.processing:
+            return
+            
         self.processing = False
+        self._shutdown.set()
+        self._ready.set()  # Wake the processor so it exits
         
     def add_command(self, command: Command, priority: int = 1):
-        """Add command to queue with priority (lower is higher priority)"""
-        self.queue.put((priority, command))
+        """
+        Add command to queue with priority (lower is higher priority)
+        
+        Priorities are clamped to 0..PRIORITY_LEVELS - 1; commands of equal
+        priority run in the order they were added.
+        """
+        priority = min(max(priority, 0), PRIORITY_LEVELS - 1)
+        self._bins[priority].append(command)
+        self._ready.set()
+        
+    def pending(self) -> int:
+        """Number of queued commands"""
+        return sum(len(commands) for commands in self._bins)
+        
+    def _next_command(self) -> Optional[Tuple[int, Command]]:
+        """Pop the oldest command of the most urgent non-empty priority"""
+        for priority, commands in enumerate(self._bins):
+            if commands:
+                try:
+                    return priority, commands.popleft()
+                except IndexError:  # Emptied since the check
+                    continue
+        return None
+        
+    def _process_commands(self, shutdown: threading.Event):
+        """Process commands from queue until shutdown is set"""
+        while not shutdown.is_set():
+            # Get next command, sleeping until one is added
+            item = self._next_command()
+            if item is None:
+                self._ready.wait()
+                self._ready.clear()
+                continue
+            priority, command = item
+            
+            # Skip expired commands
+            if self._expired(command):
+                continue
+                
+            self._execute(priority, self._take_batch(priority, command))
+            
+    def _expired(self, command: Command) -> bool:
+        """Check whether a command timed out while queued"""
+        if time.time() - command.timestamp > command.timeout:
+            logger.warning(f"Command {command.method} expired")
+            return True
+        return False
         
-    def _process_commands(self):
-        """Process commands from queue"""
-        while self.processing:
+    def _take_batch(self, priority: int, first: Command) -> List[Command]:
+        """Collect further ready commands of the same priority to send with the first"""
+        batch = [first]
+        if priority == 0:
+            return batch  # Urgent commands go out on their own
+            
+        commands = self._bins[priority]
+        while len(batch) < self.batch_max:
             try:
-                # Get next command
-                priority, command = self.queue.get(timeout=1.0)
+                command = commands.popleft()
+            except IndexError:
+                break
+            if not self._expired(command):
+                batch.append(command)
+        return batch
+        
+    def _execute(self, priority: int, batch: List[Command]):
+        """
+        Send a batch of commands one after another and complete each one
+        
+        Device sequences depend on order (set the filter, then expose), so
+        commands run in the order they were queued over the keep-alive
+        session, each seeing the state left by the one before.
+        """
+        for command in batch:
+            try:
+                previous_state = self._get_relevant_state(command)
+                result = self.api.send_command(command.method, command.params)
                 
-                # Skip expired commands
-                if time.time() - command.timestamp > command.timeout:
-                    logger.warning(f"Command {command.method} expired")
-                    continue
-                    
-                # Execute command
-                try:
-                    previous_state = self._get_relevant_state(command)
-                    result = self.api.send_command(command.method, command.params)
-                    
-                    if result:
-                        # Add to transaction log
-                        result["previous_state"] = previous_state
-                        with self._lock:
-                            self.current_transaction.add(command, result)
-                            
-                        # Call callback if provided
-                        if command.callback:
-                            command.callback(result)
-                    else:
-                        self._handle_failure(command, priority)
+                if result:
+                    # Add to transaction log
+                    result["previous_state"] = previous_state
+                    with self._lock:
+                        self.current_transaction.add(command, result)
                         
-                except Exception as e:
-                    logger.error(f"Command execution failed: {e}")
+                    # Call callback if provided
+                    if command.callback:
+                        command.callback(result)
+                else:
                     self._handle_failure(command, priority)
                     
-            except queue.Empty:
-                continue
+            except Exception as e:
+                logger.error(f"Command execution failed: {e}")
+                self._handle_failure(command, priority)
                 
     def _handle_failure(self, command: Command, priority: int):
         """Handle command failure"""
@@ -153,7 +230,7 @@ class CommandQueue:
             # Requeue command with increased priority
             command.retries += 1
             new_priority = max(0, priority - 1)  # Increase priority
-            self.queue.put((new_priority, command))
+            self._bins[new_priority].append(command)
             logger.info(f"Retrying {command.method} (attempt {command.retries + 1})")
         else:
             logger.error(f"Command {command.method} failed after {command.max_retries} retries")
@@ -224,7 +301,7 @@ class ConnectionManager:
                 
     def _attempt_connection(self):
         """Attempt to connect with exponential backoff"""
-        now = time.time()
+        now = time.monotonic()
         
         # Check if we should attempt connection
         with self._lock:
@@ -271,6 +348,8 @@ class Watchdog:
         self.running = False
         self.last_state_change = time.time()
         self.state_timeout = 60.0  # Maximum time without state change
+        self.resource_check_interval = 30.0  # seconds between resource checks
+        self._last_resource_check = None
         
     def start(self):
         """Start watchdog"""
@@ -301,8 +380,12 @@ class Watchdog:
                     logger.warning("System may be frozen, attempting recovery")
                     self._attempt_recovery()
                     
-                # Check system resources
-                self._check_resources()
+                # Check system resources, which change slowly, every 30s
+                now = time.monotonic()
+                if (self._last_resource_check is None or
+                        now - self._last_resource_check >= self.resource_check_interval):
+                    self._last_resource_check = now
+                    self._check_resources()
                 
                 time.sleep(5)
                 
@@ -330,10 +413,10 @@ class Watchdog:
             
     def _check_resources(self):
         """Check system resources"""
-        import psutil
+        import psutil  # Only needed here, and at most every 30s
         
-        # Check CPU usage
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Check CPU usage since the previous sample, without blocking
+        cpu_percent = psutil.cpu_percent(interval=None)
         if cpu_percent > 90:
             logger.warning(f"High CPU usage: {cpu_percent}%")
             
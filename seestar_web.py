@@ -5,19 +5,28 @@ Web interface for Seestar INDI driver
 Provides real-time monitoring and control with security
 """
 
+# The web server runs on gevent; patch blocking I/O before anything else is
+# imported so a handler waiting on the telescope doesn't stall every client
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:  # gevent is optional; Flask-SocketIO falls back to threads
+    pass
+
+import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from flask import Flask, render_template, jsonify, request, Response, redirect, url_for
 from flask_socketio import SocketIO, emit
 from werkzeug.security import check_password_hash
 
 from seestar_api import SeestarAPI
-from seestar_config import config_manager
+from seestar_config import config_manager, shallow_dict
 from seestar_logging import get_logger
-from seestar_monitor import DeviceMonitor
+from seestar_monitor import DeviceMonitor, DeviceState
 from seestar_auth import auth_manager, require_auth, init_ssl
 
 # Initialize Flask app
@@ -28,10 +37,18 @@ socketio = SocketIO(app)
 # Setup logging
 logger = get_logger("SeestarWeb")
 
+# /status fields and the state snapshot they were read from
+_status_cache: Tuple[Optional[DeviceState], dict] = (None, {})
+
+# Log streaming
+_LOG_CHUNK = 64 * 1024  # bytes per read
+_LOG_POLL_INTERVAL = 0.25  # seconds between checks for new output
+
 # Initialize API and monitor
 api = SeestarAPI(
     host=config_manager.config.api.host,
-    port=config_manager.config.api.port
+    port=config_manager.config.api.port,
+    cache_timeout=config_manager.config.api.cache_timeout
 )
 monitor = DeviceMonitor(api)
 
@@ -66,6 +83,31 @@ def logout():
     response.delete_cookie('token')
     return response
 
+def _status_fields(state: DeviceState) -> dict:
+    """
+    Get the /status fields of a state snapshot
+    
+    Snapshots are immutable and replaced on every change, so the dict is
+    only rebuilt when the monitor publishes a new one.
+    """
+    global _status_cache
+    cached_state, fields = _status_cache
+    if cached_state is not state:
+        fields = {
+            'connected': state.connected,
+            'ra': state.ra,
+            'dec': state.dec,
+            'slewing': state.slewing,
+            'tracking': state.tracking,
+            'exposing': state.exposing,
+            'filter_position': state.filter_position,
+            'focus_position': state.focus_position,
+            'temperature': state.focus_temperature,
+            'error': state.error
+        }
+        _status_cache = (state, fields)
+    return fields
+
 # Web routes
 @app.route('/')
 @require_auth
@@ -81,18 +123,8 @@ def index():
 @require_auth
 def status():
     """Get current device status"""
-    state = monitor.get_state()
     return jsonify({
-        'connected': state.connected,
-        'ra': state.ra,
-        'dec': state.dec,
-        'slewing': state.slewing,
-        'tracking': state.tracking,
-        'exposing': state.exposing,
-        'filter_position': state.filter_position,
-        'focus_position': state.focus_position,
-        'temperature': state.focus_temperature,
-        'error': state.error,
+        **_status_fields(monitor.get_state()),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -112,10 +144,10 @@ def config():
             return jsonify({'status': 'error', 'message': str(e)})
     else:
         return jsonify({
-            'camera': config_manager.config.camera.__dict__,
-            'focuser': config_manager.config.focuser.__dict__,
-            'filterwheel': config_manager.config.filterwheel.__dict__,
-            'api': config_manager.config.api.__dict__
+            'camera': shallow_dict(config_manager.config.camera),
+            'focuser': shallow_dict(config_manager.config.focuser),
+            'filterwheel': shallow_dict(config_manager.config.filterwheel),
+            'api': shallow_dict(config_manager.config.api)
         })
 
 @app.route('/logs')
@@ -127,17 +159,23 @@ def logs():
         if not log_file.exists():
             return
         
-        with open(log_file) as f:
-            # First yield existing content
-            content = f.read()
-            yield content
-            
-            # Then tail for new content
+        with open(log_file, 'rb') as f:
+            # Stream existing content in chunks, then tail for new content
+            partial = b""  # Start of a line still being written
             while True:
-                content = f.read()
-                if content:
-                    yield content
-                socketio.sleep(1)
+                chunk = f.read(_LOG_CHUNK)
+                if chunk:
+                    # Only send whole lines; rfind scans for the newline in C
+                    data = partial + chunk if partial else chunk
+                    end = data.rfind(b"\n") + 1
+                    if end:
+                        yield data[:end] if end < len(data) else data
+                    partial = data[end:]
+                    continue
+                    
+                # Caught up; only read again once the file has grown
+                while os.fstat(f.fileno()).st_size <= f.tell():
+                    socketio.sleep(_LOG_POLL_INTERVAL)
                 
     return Response(generate(), mimetype='text/plain')
 
@@ -149,8 +187,8 @@ def goto():
     data = request.get_json()
     try:
         result = api.goto_target(
-            str(data['ra']),
-            str(data['dec']),
+            data['ra'],
+            data['dec'],
             data.get('target_name', 'Web Target')
         )
         return jsonify({'status': 'success' if result else 'error'})
@@ -231,7 +269,7 @@ def handle_connect():
     token = request.args.get('token')
     if not token or not auth_manager.verify_token(token):
         return False
-    emit('state_update', monitor.get_state().__dict__)
+    emit('state_update', monitor.get_state().as_dict())
 
 def main():
     """Start web interface"""
@@ -259,9 +297,11 @@ def main():
     except KeyboardInterrupt:
         logger.info("Shutting down web interface")
         monitor.stop()
+        api.close()
     except Exception as e:
         logger.error(f"Web interface error: {e}")
         monitor.stop()
+        api.close()
 
 if __name__ == '__main__':
     main()
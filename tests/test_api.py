@@ -5,9 +5,11 @@ Unit tests for Seestar API client
 """
 
 import unittest
+import socket
 from unittest.mock import Mock, patch
 import json
 import requests
+from urllib.parse import parse_qs
 from seestar_api import SeestarAPI
 
 class TestSeestarAPI(unittest.TestCase):
@@ -32,6 +34,142 @@ class TestSeestarAPI(unittest.TestCase):
         self.assertEqual(result["Value"]["result"]["ra"], 10.5)
         self.assertEqual(result["Value"]["result"]["dec"], 45.0)
         
+    @patch('requests.Session.put')
+    def test_send_command_payload(self, mock_put):
+        """Test request payload is form-encoded"""
+        mock_put.return_value.json.return_value = {"Value": {"result": {}}}
+        
+        self.api.send_command("method_sync", {"method": "get_view_state"})
+        
+        payload = parse_qs(mock_put.call_args.kwargs["data"].decode())
+        self.assertEqual(payload["Action"], ["method_sync"])
+        self.assertEqual(json.loads(payload["Parameters"][0]), {"method": "get_view_state"})
+        self.assertEqual(payload["ClientID"], ["1"])
+        self.assertTrue(payload["ClientTransactionID"][0].isdigit())
+        
+        # Commands without fixed payloads are encoded on the fly
+        self.api.send_command("goto_target", {"ra": "12:00:00", "dec": "+45:00:00"})
+        
+        payload = parse_qs(mock_put.call_args.kwargs["data"].decode())
+        self.assertEqual(payload["Action"], ["goto_target"])
+        self.assertEqual(
+            json.loads(payload["Parameters"][0]),
+            {"ra": "12:00:00", "dec": "+45:00:00"}
+        )
+        
+    @patch('requests.Session.put')
+    def test_cache_key_ignores_parameter_order(self, mock_put):
+        """Test cached responses are shared across equivalent parameters"""
+        mock_put.return_value.json.return_value = {"Value": {"result": {}}}
+        
+        self.api.send_command(
+            "method_sync",
+            {"method": "start_exposure", "params": {"gain": 1, "exposure_ms": 10}},
+            use_cache=True
+        )
+        self.api.send_command(
+            "method_sync",
+            {"params": {"exposure_ms": 10, "gain": 1}, "method": "start_exposure"},
+            use_cache=True
+        )
+        
+        mock_put.assert_called_once()
+        
+    @patch('requests.Session.put')
+    def test_cache_invalidated_by_goto(self, mock_put):
+        """Test slewing drops the cached coordinates"""
+        mock_put.return_value.json.return_value = {
+            "Value": {"result": {"ra": 15.5, "dec": -30.0}}
+        }
+        
+        self.api.get_coordinates()
+        self.api.get_coordinates()
+        self.assertEqual(mock_put.call_count, 1)
+        
+        self.api.goto_target(ra="12:00:00", dec="+45:00:00")
+        self.api.get_coordinates()
+        self.assertEqual(mock_put.call_count, 3)
+        
+    @patch('requests.Session.put')
+    def test_status_cache_invalidated_by_commands(self, mock_put):
+        """Test device commands and forced refreshes bypass the cached state"""
+        mock_put.return_value.json.return_value = {
+            "Value": {"result": {"temperature": 12.5}}
+        }
+        
+        self.api.get_full_state()
+        self.api.get_full_state()
+        self.assertEqual(mock_put.call_count, 1)
+        
+        self.api.start_exposure(1.0)
+        self.api.get_full_state()
+        self.assertEqual(mock_put.call_count, 3)
+        
+        self.api.get_full_state(use_cache=False)
+        self.assertEqual(mock_put.call_count, 4)
+        
+    @patch('requests.Session.put')
+    def test_failed_requests_cached_briefly(self, mock_put):
+        """Test failures of cached queries are not retried immediately"""
+        mock_put.side_effect = requests.exceptions.ConnectionError()
+        
+        self.assertIsNone(self.api.get_temperature())
+        self.assertIsNone(self.api.get_temperature())
+        
+        mock_put.assert_called_once()
+        
+    @patch('requests.Session.put')
+    def test_send_batch(self, mock_put):
+        """Test batched commands return responses in call order"""
+        def respond(url, data, **kwargs):
+            params = json.loads(parse_qs(data.decode())["Parameters"][0])
+            response = Mock()
+            response.json.return_value = {"method": params["method"]}
+            return response
+        mock_put.side_effect = respond
+        
+        results = self.api.send_batch([
+            ("method_sync", {"method": "get_view_state"}),
+            ("method_sync", {"method": "get_device_state"}),
+            ("method_sync", {"method": "scope_get_equ_coord"})
+        ])
+        
+        self.assertEqual(
+            [result["method"] for result in results],
+            ["get_view_state", "get_device_state", "scope_get_equ_coord"]
+        )
+        self.assertEqual(mock_put.call_count, 3)
+        
+    def test_cache_size_bounded(self):
+        """Test the response cache evicts entries beyond its limit"""
+        self.api._cache_max_entries = 4
+        for i in range(10):
+            self.api._update_cache(("method_sync", i), i, 60)
+            
+        self.assertEqual(len(self.api._snapshot), 4)
+        self.assertTrue(self.api._is_cache_valid(("method_sync", 9)))
+        self.assertFalse(self.api._is_cache_valid(("method_sync", 0)))
+        
+    @patch('requests.Session.put')
+    def test_full_state_fills_query_caches(self, mock_put):
+        """Test one device state request answers the other status queries"""
+        mock_put.return_value.json.return_value = {
+            "Value": {
+                "result": {
+                    "temperature": 12.5,
+                    "ra": 15.5,
+                    "dec": -30.0,
+                    "View": {"stage": "AutoGoto"}
+                }
+            }
+        }
+        
+        self.assertEqual(self.api.get_temperature(), 12.5)
+        self.assertEqual(self.api.get_coordinates(), {"ra": 15.5, "dec": -30.0})
+        self.assertTrue(self.api.is_slewing())
+        
+        mock_put.assert_called_once()
+        
     @patch('requests.Session.put')
     def test_send_command_network_error(self, mock_put):
         """Test handling of network errors"""
@@ -58,6 +196,28 @@ class TestSeestarAPI(unittest.TestCase):
         
         self.assertIsNone(result)
         
+    def test_retry_policy(self):
+        """Test PUT commands are retried with jittered backoff"""
+        retries = self.api.session.get_adapter(self.api.base_url).max_retries
+        
+        self.assertIn("PUT", retries.allowed_methods)
+        self.assertIn(503, retries.status_forcelist)
+        
+        # Two consecutive failures give a base backoff of 1s plus up to 0.5s jitter
+        retries = retries.increment(method="PUT", url=self.api.base_url)
+        retries = retries.increment(method="PUT", url=self.api.base_url)
+        backoff = retries.get_backoff_time()
+        self.assertGreaterEqual(backoff, 1.0)
+        self.assertLessEqual(backoff, 1.5)
+        
+    def test_socket_options(self):
+        """Test pooled connections disable Nagle and enable keep-alive"""
+        adapter = self.api.session.get_adapter(self.api.base_url)
+        options = adapter.poolmanager.connection_pool_kw["socket_options"]
+        
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), options)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+        
     def test_get_coordinates(self):
         """Test coordinate retrieval"""
         with patch.object(self.api, 'send_command') as mock_send:
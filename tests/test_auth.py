@@ -9,6 +9,7 @@ import jwt
 import time
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
+from pathlib import Path
 
 from seestar_auth import AuthManager, require_auth
 
@@ -24,6 +25,18 @@ class TestAuthManager(unittest.TestCase):
         self.auth.add_user(self.test_user, self.test_pass)
         self.assertIn(self.test_user, self.auth.users)
         
+    def test_load_users(self):
+        """Test users from configuration are hashed on startup"""
+        mock_config = Mock()
+        mock_config.auth.users = {"alice": "secret1", "bob": "secret2"}
+        
+        with patch('seestar_auth.config_manager.config', mock_config):
+            auth = AuthManager()
+            
+        self.assertEqual(set(auth.users), {"alice", "bob"})
+        self.assertTrue(auth.verify_password("alice", "secret1"))
+        self.assertTrue(auth.verify_password("bob", "secret2"))
+        
     def test_verify_password(self):
         """Test password verification"""
         self.auth.add_user(self.test_user, self.test_pass)
@@ -43,6 +56,32 @@ class TestAuthManager(unittest.TestCase):
             self.auth.verify_password("nonexistent", self.test_pass)
         )
         
+    def test_verify_password_cache(self):
+        """Test repeated logins skip bcrypt"""
+        self.auth.add_user(self.test_user, self.test_pass)
+        self.assertTrue(self.auth.verify_password(self.test_user, self.test_pass))
+        
+        with patch('bcrypt.checkpw') as mock_checkpw:
+            self.assertTrue(self.auth.verify_password(self.test_user, self.test_pass))
+            mock_checkpw.assert_not_called()
+            
+        # Changing the password invalidates cached verifications
+        self.auth.add_user(self.test_user, "newpass456")
+        self.assertFalse(self.auth.verify_password(self.test_user, self.test_pass))
+        self.assertTrue(self.auth.verify_password(self.test_user, "newpass456"))
+        
+        # A cache hit keeps the entry from being evicted first
+        self.auth._verify_cache_size = 2
+        self.auth.add_user("other", "otherpass789")
+        self.assertTrue(self.auth.verify_password("other", "otherpass789"))
+        self.assertTrue(self.auth.verify_password(self.test_user, "newpass456"))
+        self.auth.add_user("third", "thirdpass012")
+        self.assertTrue(self.auth.verify_password("third", "thirdpass012"))
+        self.assertEqual(
+            [key[0] for key in self.auth._verify_cache],
+            [self.test_user, "third"]
+        )
+        
     def test_token_generation_and_verification(self):
         """Test JWT token handling"""
         # Generate token
@@ -56,6 +95,39 @@ class TestAuthManager(unittest.TestCase):
         # Test invalid token
         self.assertIsNone(self.auth.verify_token("invalid.token.here"))
         
+    def test_token_cache(self):
+        """Test verified tokens skip decoding"""
+        token = self.auth.generate_token(self.test_user)
+        self.assertEqual(self.auth.verify_token(token), self.test_user)
+        
+        with patch.object(self.auth, '_sign') as mock_sign:
+            self.assertEqual(self.auth.verify_token(token), self.test_user)
+            mock_sign.assert_not_called()
+            
+        # A cache hit keeps the token from being evicted first
+        self.auth._token_cache_size = 2
+        other = self.auth.generate_token("other")
+        self.auth.verify_token(other)
+        self.auth.verify_token(token)
+        third = self.auth.generate_token("third")
+        self.auth.verify_token(third)
+        self.assertEqual(list(self.auth._token_cache), [token, third])
+            
+    def test_token_interop(self):
+        """Test tokens match PyJWT in both directions and tampering is caught"""
+        token = self.auth.generate_token(self.test_user)
+        payload = jwt.decode(token, self.auth.secret_key, algorithms=['HS256'])
+        self.assertEqual(payload['username'], self.test_user)
+        
+        header, body, signature = token.split('.')
+        forged = jwt.encode({'username': 'admin', 'exp': payload['exp']}, 'wrong-key', algorithm='HS256')
+        self.assertIsNone(self.auth.verify_token(f"{header}.{forged.split('.')[1]}.{signature}"))
+        self.assertIsNone(self.auth.verify_token(forged))
+        
+        # A correctly signed token with a non-numeric exp is rejected
+        token = jwt.encode({'username': self.test_user, 'exp': 'never'}, self.auth.secret_key, algorithm='HS256')
+        self.assertIsNone(self.auth.verify_token(token))
+            
     def test_token_expiration(self):
         """Test token expiration"""
         # Create token that expires in 1 second
@@ -99,6 +171,17 @@ class TestAuthManager(unittest.TestCase):
         time.sleep(1.1)  # Wait for window to pass
         self.assertTrue(self.auth.check_rate_limit(ip2, limit=1, window=1))
 
+    def test_rate_limit_pruning(self):
+        """Test idle rate limit buckets are dropped"""
+        self.auth.check_rate_limit("127.0.0.3", limit=10, window=1)
+        self.assertIn("127.0.0.3", self.auth.rate_limits)
+        
+        time.sleep(1.1)  # Bucket refills completely
+        self.auth.check_rate_limit("127.0.0.4", limit=10, window=1)
+        
+        self.assertNotIn("127.0.0.3", self.auth.rate_limits)
+        self.assertIn("127.0.0.4", self.auth.rate_limits)
+
 class TestAuthDecorator(unittest.TestCase):
     def setUp(self):
         """Set up test environment"""
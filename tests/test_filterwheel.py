@@ -5,10 +5,11 @@ Unit tests for Seestar filter wheel driver
 """
 
 import unittest
+import time
 from unittest.mock import Mock, patch
 import PyIndi
 from seestar_api import SeestarAPI
-from seestar_monitor import DeviceMonitor
+from seestar_monitor import DeviceMonitor, DeviceState, FilterSnap
 from seestar_filterwheel import SeestarFilterWheel
 
 class TestSeestarFilterWheel(unittest.TestCase):
@@ -17,10 +18,9 @@ class TestSeestarFilterWheel(unittest.TestCase):
         self.mock_api = Mock(spec=SeestarAPI)
         self.mock_monitor = Mock(spec=DeviceMonitor)
         
-        # Setup monitor state
-        self.mock_monitor.state.filter_position = 0
-        self.mock_monitor.state.filter_moving = False
-        self.mock_monitor.state.error = None
+        # Setup monitor state: filter at slot 0, idle, no error. state is
+        # an instance attribute, so the spec doesn't provide it
+        self.mock_monitor.state = DeviceState()
         
         self.filterwheel = SeestarFilterWheel(self.mock_api, self.mock_monitor)
         self.filterwheel.initProperties()
@@ -92,7 +92,7 @@ class TestSeestarFilterWheel(unittest.TestCase):
     def test_movement_while_moving(self):
         """Test starting movement while already moving"""
         # Set filter wheel as moving
-        self.mock_monitor.state.filter_moving = True
+        self.mock_monitor.state = DeviceState(filter=FilterSnap(moving=True))
         
         # Create mock values for position
         values = Mock()
@@ -129,6 +129,20 @@ class TestSeestarFilterWheel(unittest.TestCase):
         self.filterwheel._handle_state_change(event)
         self.assertEqual(self.filterwheel.filterSlotProp.s, PyIndi.IPS_OK)
         
+    def test_state_updates_coalesced(self):
+        """Test a burst of state changes sends the slot property once"""
+        flush = self.filterwheel._flush_slot_update
+        with patch.object(self.filterwheel, 'IDSetNumber') as mock_set, \
+             patch.object(self.filterwheel, 'IDMessage'), \
+             patch.object(self.filterwheel, '_flush_slot_update', wraps=flush) as mock_flush:
+            self.filterwheel._handle_state_change({"property": "filter_position", "new_value": 1})
+            self.filterwheel._handle_state_change({"property": "filter_moving", "new_value": False})
+            mock_set.assert_not_called()
+            time.sleep(0.1)
+            
+        mock_flush.assert_called_once_with()
+        mock_set.assert_called_once_with(self.filterwheel.filterSlotProp)
+        
     def test_error_handling(self):
         """Test error state handling"""
         event = {
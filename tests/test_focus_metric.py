@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for Seestar focus metrics
+"""
+
+import unittest
+import numpy as np
+
+from seestar_focus_metric import (
+    half_flux_diameter,
+    central_hfd,
+    _hfd_loop,
+    _hfd_vectorized
+)
+
+def _star(shape, cx, cy, sigma, peak=1000.0, background=100.0):
+    """Synthetic image with a Gaussian star on a flat background"""
+    ys, xs = np.mgrid[:shape[0], :shape[1]]
+    return background + peak * np.exp(-((xs - cx) ** 2 + (ys - cy) ** 2) / (2 * sigma ** 2))
+
+class TestHalfFluxDiameter(unittest.TestCase):
+    def test_gaussian_star(self):
+        """Test the HFD of a Gaussian star matches its profile"""
+        # The flux-weighted mean radius of a Gaussian is sigma * sqrt(pi / 2)
+        image = _star((100, 100), 50, 50, sigma=2.0)
+        hfd = half_flux_diameter(image, 50, 50, radius=16)
+        self.assertAlmostEqual(hfd, 2 * 2.0 * np.sqrt(np.pi / 2), delta=0.3)
+        
+    def test_defocused_star_is_larger(self):
+        """Test a wider star gives a larger HFD"""
+        sharp = half_flux_diameter(_star((100, 100), 50, 50, sigma=1.5), 50, 50, radius=16)
+        soft = half_flux_diameter(_star((100, 100), 50, 50, sigma=3.0), 50, 50, radius=16)
+        self.assertGreater(soft, sharp)
+        
+    def test_flat_image(self):
+        """Test an image without a star has no HFD"""
+        image = np.full((100, 100), 100.0)
+        self.assertEqual(half_flux_diameter(image, 50, 50, radius=16), 0.0)
+        
+    def test_star_near_edge(self):
+        """Test the aperture is clipped at the image border"""
+        image = _star((100, 100), 3, 3, sigma=1.5)
+        hfd = half_flux_diameter(image, 3, 3, radius=16)
+        self.assertGreater(hfd, 0)
+        self.assertLess(hfd, 10)
+        
+    def test_kernels_agree(self):
+        """Test the loop and numpy kernels give the same HFD"""
+        window = np.clip(_star((33, 33), 16, 16, sigma=2.5) - 100.0, 0.0, None).astype(np.float32)
+        self.assertAlmostEqual(
+            _hfd_loop(window, 16, 16, 16),
+            _hfd_vectorized(window, 16, 16, 16),
+            places=3
+        )
+
+class TestCentralHFD(unittest.TestCase):
+    def test_central_star(self):
+        """Test the star in the central quarter is measured"""
+        image = _star((200, 200), 90, 110, sigma=2.0)
+        self.assertAlmostEqual(
+            central_hfd(image),
+            half_flux_diameter(image, 90, 110, radius=16),
+            places=6
+        )
+        
+    def test_ignores_edge_stars(self):
+        """Test brighter stars outside the central quarter are ignored"""
+        image = _star((200, 200), 100, 100, sigma=2.0)
+        image += _star((200, 200), 10, 10, sigma=4.0, peak=5000.0, background=0.0)
+        self.assertAlmostEqual(
+            central_hfd(image),
+            half_flux_diameter(image, 100, 100, radius=16),
+            places=6
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,9 +6,10 @@ Unit tests for Seestar focuser driver
 
 import unittest
 from unittest.mock import Mock, patch
+import numpy as np
 import PyIndi
 from seestar_api import SeestarAPI
-from seestar_monitor import DeviceMonitor
+from seestar_monitor import DeviceMonitor, DeviceState, FocusSnap
 from seestar_focuser import SeestarFocuser
 
 class TestSeestarFocuser(unittest.TestCase):
@@ -17,12 +18,11 @@ class TestSeestarFocuser(unittest.TestCase):
         self.mock_api = Mock(spec=SeestarAPI)
         self.mock_monitor = Mock(spec=DeviceMonitor)
         
-        # Setup monitor state
-        self.mock_monitor.state.focus_position = 50000
-        self.mock_monitor.state.focus_moving = False
-        self.mock_monitor.state.auto_focusing = False
-        self.mock_monitor.state.focus_temperature = 20.0
-        self.mock_monitor.state.error = None
+        # Setup monitor state: focuser idle at 50000, 20C, no error. state
+        # is an instance attribute, so the spec doesn't provide it
+        self.mock_monitor.state = DeviceState(
+            focus=FocusSnap(position=50000, temperature=20.0)
+        )
         
         self.focuser = SeestarFocuser(self.mock_api, self.mock_monitor)
         self.focuser.initProperties()
@@ -131,7 +131,7 @@ class TestSeestarFocuser(unittest.TestCase):
     def test_movement_while_moving(self):
         """Test starting movement while already moving"""
         # Set focuser as moving
-        self.mock_monitor.state.focus_moving = True
+        self.mock_monitor.state = DeviceState(focus=FocusSnap(position=50000, moving=True))
         
         # Create mock values for position
         values = Mock()
@@ -149,7 +149,7 @@ class TestSeestarFocuser(unittest.TestCase):
     def test_auto_focus_while_moving(self):
         """Test starting auto focus while moving"""
         # Set focuser as moving
-        self.mock_monitor.state.focus_moving = True
+        self.mock_monitor.state = DeviceState(focus=FocusSnap(position=50000, moving=True))
         
         # Create mock values for auto focus
         states = Mock()
@@ -171,7 +171,7 @@ class TestSeestarFocuser(unittest.TestCase):
             "property": "focus_position",
             "new_value": 60000
         }
-        self.focuser._handle_state_change(event)
+        self.focuser._on_focus_position(event)
         self.assertEqual(self.focuser.positionProp.np[0].value, 60000)
         
         # Test movement state change
@@ -179,11 +179,11 @@ class TestSeestarFocuser(unittest.TestCase):
             "property": "focus_moving",
             "new_value": True
         }
-        self.focuser._handle_state_change(event)
+        self.focuser._on_focus_moving(event)
         self.assertEqual(self.focuser.positionProp.s, PyIndi.IPS_BUSY)
         
         event["new_value"] = False
-        self.focuser._handle_state_change(event)
+        self.focuser._on_focus_moving(event)
         self.assertEqual(self.focuser.positionProp.s, PyIndi.IPS_OK)
         
         # Test temperature change
@@ -191,18 +191,42 @@ class TestSeestarFocuser(unittest.TestCase):
             "property": "focus_temperature",
             "new_value": 22.5
         }
-        self.focuser._handle_state_change(event)
+        self.focuser._on_focus_temperature(event)
         self.assertEqual(self.focuser.temperatureProp.np[0].value, 22.5)
         
+    def test_property_callbacks(self):
+        """Test callbacks are registered per focuser property"""
+        registered = {
+            call.args[0] for call in self.mock_monitor.add_event_callback.call_args_list
+        }
+        self.assertEqual(registered, {
+            "focus_position", "focus_moving", "auto_focusing",
+            "focus_temperature", "error"
+        })
+        
     def test_error_handling(self):
         """Test error state handling"""
         event = {
             "property": "error",
             "new_value": "Test error"
         }
-        self.focuser._handle_state_change(event)
+        self.focuser._on_error(event)
         self.assertEqual(self.focuser.positionProp.s, PyIndi.IPS_ALERT)
         
+    def test_focus_metric(self):
+        """Test focus metric reporting"""
+        # Gaussian star in the middle of a flat background
+        ys, xs = np.mgrid[:200, :200]
+        image = 100 + 1000 * np.exp(-((xs - 100) ** 2 + (ys - 100) ** 2) / (2 * 2.0 ** 2))
+        
+        with patch.object(self.focuser, 'IDSetNumber'):
+            hfd = self.focuser.update_focus_metric(image)
+            
+        self.assertGreater(hfd, 0)
+        self.assertLess(hfd, 10)
+        self.assertEqual(self.focuser.focusMetricProp.np[0].value, hfd)
+        self.assertEqual(self.focuser.focusMetricProp.s, PyIndi.IPS_OK)
+        
     def test_connection_control(self):
         """Test connection control"""
         # Create mock values for connection
@@ -43,6 +43,7 @@ class TestFITSHandler(unittest.TestCase):
     def tearDown(self):
         """Clean up test environment"""
         import shutil
+        self.fits_handler.close()
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
             
@@ -75,6 +76,68 @@ class TestFITSHandler(unittest.TestCase):
             self.assertEqual(header['RA'], self.test_header.ra)
             self.assertEqual(header['DEC'], self.test_header.dec)
             
+    def test_generated_filenames_unique(self):
+        """Test frames saved within one second get distinct names"""
+        paths = {
+            self.fits_handler.save_fits(self.test_data, self.test_header)
+            for _ in range(3)
+        }
+        self.assertEqual(len(paths), 3)
+        
+    def test_fits_saving_uint16(self):
+        """Test integer frames are stored as 16-bit"""
+        raw = np.random.randint(0, 4096, (100, 100)).astype(np.int64)
+        filepath = self.fits_handler.save_fits(raw, self.test_header, filename="raw.fits")
+        
+        with fits.open(filepath) as hdul:
+            self.assertEqual(hdul[0].header['BITPIX'], 16)
+            self.assertEqual(hdul[0].header['BZERO'], 32768)
+            self.assertEqual(hdul[0].data.dtype, np.uint16)
+            np.testing.assert_array_equal(hdul[0].data, raw)
+            
+    def test_fits_saving_out_of_range(self):
+        """Test integer frames outside 16 bits keep their type"""
+        raw = np.array([[-1, 70000], [0, 100]], dtype=np.int32)
+        filepath = self.fits_handler.save_fits(raw, self.test_header, filename="wide.fits")
+        
+        with fits.open(filepath) as hdul:
+            self.assertEqual(hdul[0].header['BITPIX'], 32)
+            np.testing.assert_array_equal(hdul[0].data, raw)
+            
+    def test_fits_saving_uint8(self):
+        """Test narrower integer frames are left alone"""
+        raw = np.arange(16, dtype=np.uint8).reshape(4, 4)
+        filepath = self.fits_handler.save_fits(raw, self.test_header, filename="narrow.fits")
+        
+        with fits.open(filepath) as hdul:
+            self.assertEqual(hdul[0].header['BITPIX'], 8)
+            np.testing.assert_array_equal(hdul[0].data, raw)
+            
+    def test_fits_saving_async(self):
+        """Test background FITS saving"""
+        future = self.fits_handler.save_fits_async(
+            self.test_data,
+            self.test_header,
+            filename="async.fits"
+        )
+        filepath = future.result(timeout=10)
+        
+        with fits.open(filepath) as hdul:
+            np.testing.assert_array_almost_equal(hdul[0].data, self.test_data)
+            self.assertEqual(hdul[0].header['OBJECT'], self.test_header.object_name)
+            
+    def test_close_flushes_writes(self):
+        """Test closing waits for background writes"""
+        futures = [
+            self.fits_handler.save_fits_async(self.test_data, self.test_header)
+            for _ in range(3)
+        ]
+        self.fits_handler.close()
+        
+        for future in futures:
+            self.assertTrue(future.done())
+            self.assertTrue(os.path.exists(future.result()))
+            
     def test_fits_loading(self):
         """Test FITS file loading"""
         # Save test file
@@ -121,18 +184,18 @@ class TestPlateSolver(unittest.TestCase):
         if os.path.exists("test_images"):
             shutil.rmtree("test_images")
             
-    @patch('astroquery.astrometry_net.AstrometryNet.solve_from_image')
+    @patch('astroquery.astrometry_net.core.AstrometryNetClass.solve_from_image')
     def test_online_solving(self, mock_solve):
         """Test online plate solving"""
         # Setup mock WCS solution
         mock_wcs = WCS(naxis=2)
         mock_wcs.wcs.crval = [10.0, 45.0]
-        mock_wcs.wcs.crpix = [50, 50]
+        mock_wcs.wcs.crpix = [50.5, 50.5]
         mock_wcs.wcs.cdelt = [0.1, 0.1]
         mock_solve.return_value = mock_wcs.to_header()
         
         # Solve plate
-        solution = self.plate_solver._solve_online(self.test_file)
+        solution = self.plate_solver._solve_online(self.test_file, include_wcs=True)
         
         # Verify solution
         self.assertIsNotNone(solution)
@@ -149,18 +212,40 @@ class TestPlateSolver(unittest.TestCase):
             # Create mock WCS file
             wcs = WCS(naxis=2)
             wcs.wcs.crval = [10.0, 45.0]
-            wcs.wcs.crpix = [50, 50]
+            wcs.wcs.crpix = [50.5, 50.5]
             wcs.wcs.cdelt = [0.1, 0.1]
-            wcs.to_header().tofile(self.test_file.replace('.fits', '.wcs'))
+            
+            # solve-field records the image size, not NAXISn, in its output
+            wcs_header = wcs.to_header()
+            wcs_header['IMAGEW'] = 100
+            wcs_header['IMAGEH'] = 100
+            fits.PrimaryHDU(header=wcs_header).writeto(
+                self.test_file.replace('.fits', '.wcs')
+            )
             
             # Solve plate
-            solution = self.plate_solver._solve_local(self.test_file)
+            solution = self.plate_solver._solve_local(self.test_file, include_wcs=True)
             
             # Verify solution
             self.assertIsNotNone(solution)
             self.assertIsInstance(solution['wcs'], WCS)
             self.assertAlmostEqual(solution['ra'], 10.0, places=1)
             self.assertAlmostEqual(solution['dec'], 45.0, places=1)
+            
+            # Search is limited to the pointing from the FITS header
+            cmd = mock_run.call_args[0][0]
+            self.assertEqual(cmd[0], 'solve-field')
+            self.assertEqual(cmd[cmd.index('--ra') + 1], '10.0')
+            self.assertEqual(cmd[cmd.index('--dec') + 1], '45.0')
+            self.assertEqual(
+                cmd[cmd.index('--radius') + 1],
+                str(self.plate_solver.search_radius)
+            )
+            self.assertEqual(cmd[-1], self.test_file)
+            
+            # The WCS object is only returned on request
+            solution = self.plate_solver._solve_local(self.test_file)
+            self.assertNotIn('wcs', solution)
 
 class TestASCOMBridge(unittest.TestCase):
     def setUp(self):
@@ -193,6 +278,26 @@ class TestASCOMBridge(unittest.TestCase):
         self.assertEqual(ra, 10.5)
         self.assertEqual(dec, 45.5)
         
+    def test_status(self):
+        """Test combined status query"""
+        self.mock_api.send_batch.return_value = [
+            {'ra': '10.5', 'dec': '45.5'},
+            {'enabled': True}
+        ]
+        
+        status = self.bridge.get_status()
+        self.assertEqual(status, {'ra': 10.5, 'dec': 45.5, 'tracking': True})
+        self.mock_api.send_batch.assert_called_once_with([
+            ("get_coordinates", {}),
+            ("get_tracking", {})
+        ])
+        
+    def test_status_failure(self):
+        """Test combined status query when coordinates fail"""
+        self.mock_api.send_batch.return_value = [None, {'enabled': True}]
+        
+        self.assertIsNone(self.bridge.get_status())
+        
     def test_slewing(self):
         """Test mount slewing"""
         # Test successful slew
@@ -242,6 +347,7 @@ class TestIntegrationManager(unittest.TestCase):
     def tearDown(self):
         """Clean up test environment"""
         import shutil
+        self.manager.close()
         if os.path.exists("images"):
             shutil.rmtree("images")
             
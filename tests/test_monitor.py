@@ -8,9 +8,10 @@ import unittest
 from unittest.mock import Mock, patch
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
 from seestar_api import SeestarAPI
-from seestar_monitor import DeviceMonitor, DeviceState
+from seestar_monitor import DeviceMonitor, DeviceState, _evolve
 
 class TestDeviceMonitor(unittest.TestCase):
     def setUp(self):
@@ -72,6 +73,60 @@ class TestDeviceMonitor(unittest.TestCase):
         self.assertEqual(received_event["property"], "ra")
         self.assertEqual(received_event["new_value"], 12.0)
         
+    def test_state_snapshots(self):
+        """Test updates publish a new snapshot instead of mutating"""
+        before = self.monitor.get_state()
+        self.monitor._update_state({"ra": 5.0})
+        after = self.monitor.get_state()
+        
+        self.assertIsNot(before, after)
+        self.assertEqual(before.ra, 0.0)
+        self.assertEqual(after.ra, 5.0)
+        
+    def test_state_groups(self):
+        """Test a change only rebuilds its own state group"""
+        before = self.monitor.get_state()
+        self.monitor._update_state({"ra": 5.0})
+        after = self.monitor.get_state()
+        
+        self.assertEqual(after.mount.ra, 5.0)
+        self.assertIsNot(after.mount, before.mount)
+        self.assertIs(after.focus, before.focus)
+        self.assertIs(after.filter, before.filter)
+        self.assertEqual(after.as_dict()["ra"], 5.0)
+        
+    def test_update_queues_one_item(self):
+        """Test all changes from one update share one queue item"""
+        self.monitor._update_state({"ra": 1.0, "dec": 2.0, "slewing": True})
+        
+        events = self.monitor.event_queue.get_nowait()
+        self.assertEqual([e["property"] for e in events], ["ra", "dec", "slewing"])
+        self.assertTrue(self.monitor.event_queue.empty())
+        
+    def test_property_callbacks(self):
+        """Test callbacks registered for a single state attribute"""
+        callback_called = threading.Event()
+        received = []
+        
+        def test_callback(event):
+            received.append(event["property"])
+            callback_called.set()
+            
+        # Keep the poll loop from changing state on its own
+        self.mock_api.get_coordinates.return_value = None
+        self.mock_api.is_slewing.return_value = False
+        self.mock_api.get_temperature.return_value = None
+        
+        self.monitor.add_event_callback("dec", test_callback)
+        self.monitor.start()
+        
+        # Only changes of the registered attribute are delivered
+        self.monitor._update_state({"ra": 12.0})
+        self.monitor._update_state({"dec": 30.0})
+        
+        callback_called.wait(timeout=1.0)
+        self.assertEqual(received, ["dec"])
+        
     def test_monitor_loop(self):
         """Test monitoring loop functionality"""
         # Mock API responses
@@ -97,6 +152,59 @@ class TestDeviceMonitor(unittest.TestCase):
         # Stop monitor
         self.monitor.stop()
         
+    def test_concurrent_status_poll(self):
+        """Test status queries are issued concurrently"""
+        def slow(value):
+            def query():
+                time.sleep(0.3)
+                return value
+            return query
+            
+        self.mock_api.get_coordinates.side_effect = slow({"ra": 1.0, "dec": 2.0})
+        self.mock_api.is_slewing.side_effect = slow(True)
+        self.mock_api.get_temperature.side_effect = slow(15.0)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.monitor._poll_executor = executor
+            
+            start = time.time()
+            coords, slewing, temp = self.monitor._poll_status()
+            elapsed = time.time() - start
+            
+        self.assertEqual(coords, {"ra": 1.0, "dec": 2.0})
+        self.assertTrue(slewing)
+        self.assertEqual(temp, 15.0)
+        self.assertLess(elapsed, 0.8)  # Fully sequential polling would take 0.9s
+        
+    def test_adaptive_poll_interval(self):
+        """Test polling slows down when the device is idle"""
+        # Recent change keeps fast polling
+        self.monitor._update_state({"ra": 12.0})
+        self.assertEqual(self.monitor._next_poll_interval(), self.monitor.poll_interval)
+        
+        # Idle device backs off
+        self.monitor._last_change = time.monotonic() - self.monitor.idle_after - 1
+        self.assertEqual(self.monitor._next_poll_interval(), self.monitor.idle_poll_interval)
+        
+        # Flags the poll never clears don't hold fast polling
+        self.monitor.state = _evolve(self.monitor.state, {
+            "auto_focusing": True, "focus_moving": True, "filter_moving": True
+        })
+        self.assertEqual(self.monitor._next_poll_interval(), self.monitor.idle_poll_interval)
+        
+        # Busy device polls fast even without changes
+        self.monitor.state = _evolve(self.monitor.state, {"slewing": True})
+        self.assertEqual(self.monitor._next_poll_interval(), self.monitor.poll_interval)
+        
+    def test_exposure_done_event(self):
+        """Test the exposure completion event follows the exposing flag"""
+        self.monitor.exposure_done.set()
+        self.monitor.start_exposure(duration=1.0, gain=1)
+        self.assertFalse(self.monitor.exposure_done.is_set())
+        
+        self.monitor._update_state({"exposing": False})
+        self.assertTrue(self.monitor.exposure_done.wait(timeout=1.0))
+        
     def test_exposure_tracking(self):
         """Test exposure state tracking"""
         # Start a mock exposure
@@ -162,10 +270,10 @@ class TestDeviceMonitor(unittest.TestCase):
         """Test event queue overflow handling"""
         # Fill event queue
         for i in range(25):  # More than queue size
-            self.monitor.event_queue.put({
+            self.monitor.event_queue.put([{
                 "type": "test_event",
                 "value": i
-            })
+            }])
             
         # Queue should not exceed max size
         self.assertLessEqual(self.monitor.event_queue.qsize(), 20)
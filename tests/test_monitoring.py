@@ -15,7 +15,8 @@ from seestar_monitoring import (
     HealthStatus,
     PerformanceProfiler,
     MonitoringSystem,
-    METRICS
+    METRICS,
+    _sample_system_usage
 )
 
 class TestHealthChecker(unittest.TestCase):
@@ -74,6 +75,26 @@ class TestHealthChecker(unittest.TestCase):
         status = self.health_checker._check_device_health()
         self.assertEqual(status.status, "unhealthy")
         
+    def test_checks_run_concurrently(self):
+        """Test a slow API check doesn't hold up the others"""
+        def slow_response(*args):
+            time.sleep(0.5)
+            return {"status": "ok"}
+        self.mock_api.send_command.side_effect = slow_response
+        self.health_checker._checks["device"] = Mock(
+            side_effect=lambda: time.sleep(0.5)
+        )
+        self.health_checker._checks["performance"] = Mock()
+        self.health_checker._checks["system"] = Mock()
+        
+        start = time.monotonic()
+        checks = self.health_checker.check_health()
+        self.assertLess(time.monotonic() - start, 0.9)
+        self.assertEqual(
+            list(checks),
+            ["api", "device", "performance", "system"]
+        )
+        
     def test_performance_health_check(self):
         """Test performance health checking"""
         # Setup mock stats
@@ -113,6 +134,7 @@ class TestHealthChecker(unittest.TestCase):
         mock_disk.return_value = Mock(percent=70.0)
         
         # Test healthy system
+        _sample_system_usage.cache_clear()
         status = self.health_checker._check_system_health()
         self.assertEqual(status.status, "healthy")
         
@@ -121,6 +143,7 @@ class TestHealthChecker(unittest.TestCase):
         mock_memory.return_value = Mock(percent=95.0)
         mock_disk.return_value = Mock(percent=95.0)
         
+        _sample_system_usage.cache_clear()
         status = self.health_checker._check_system_health()
         self.assertEqual(status.status, "degraded")
 
@@ -220,6 +243,29 @@ class TestMonitoringSystem(unittest.TestCase):
             1
         )
         
+    def test_cache_counters_count_deltas(self):
+        """Test cumulative cache stats are exported as deltas"""
+        self.mock_monitor.get_state.return_value = Mock(
+            focus_temperature=20.0,
+            focus_position=1000,
+            filter_position=1
+        )
+        stats = {
+            "cache_stats": {"hits": 80, "misses": 20},
+            "current_batch_size": 0
+        }
+        self.mock_optimizer.get_performance_stats.return_value = stats
+        
+        hits = METRICS['cache_hits_total']._value.get()
+        self.monitoring._update_metrics()
+        self.monitoring._update_metrics()
+        self.assertEqual(METRICS['cache_hits_total']._value.get(), hits + 80)
+        
+        # Only new hits are added on the next tick
+        stats["cache_stats"] = {"hits": 90, "misses": 20}
+        self.monitoring._update_metrics()
+        self.assertEqual(METRICS['cache_hits_total']._value.get(), hits + 90)
+        
     def test_health_reporting(self):
         """Test health reporting"""
         # Get health report
@@ -238,6 +284,18 @@ class TestMonitoringSystem(unittest.TestCase):
         self.assertIn('performance', components)
         self.assertIn('system', components)
         
+    def test_overall_status_is_worst(self):
+        """Test the overall status reports the worst component"""
+        now = datetime.now()
+        self.monitoring.health_checker.check_health = Mock(return_value={
+            "api": HealthStatus("api", "healthy", {}, now),
+            "device": HealthStatus("device", "unhealthy", {}, now),
+            "performance": HealthStatus("performance", "degraded", {}, now)
+        })
+        
+        report = self.monitoring.get_health_report()
+        self.assertEqual(report['overall_status'], "unhealthy")
+        
     def test_profiling_integration(self):
         """Test profiling integration"""
         # Start profile
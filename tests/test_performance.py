@@ -4,6 +4,7 @@
 Unit tests for Seestar performance optimization system
 """
 
+import os
 import unittest
 import time
 import json
@@ -130,6 +131,9 @@ class TestRequestBatcher(unittest.TestCase):
         callback_called.wait(timeout=0.2)
         self.assertTrue(callback_called.is_set())
         
+        # A lone request is sent as a plain command, not a batch envelope
+        self.mock_api.send_command.assert_called_once_with("test_method", {})
+        
         # Stop batcher
         self.batcher.stop()
 
@@ -152,6 +156,16 @@ class TestResponseCompressor(unittest.TestCase):
         self.assertTrue(is_compressed)
         self.assertLess(len(compressed), len(large_data))
         
+    def test_incompressible_data_skipped(self):
+        """Test high-entropy data is passed through without compressing"""
+        random_data = os.urandom(4096)
+        with patch.object(self.compressor, '_gzip_template') as mock_template:
+            compressed, is_compressed = self.compressor.compress(random_data)
+            
+        self.assertFalse(is_compressed)
+        self.assertIs(compressed, random_data)
+        mock_template.copy.assert_not_called()
+        
     def test_compression_roundtrip(self):
         """Test compression and decompression"""
         original = b"test data" * 100
@@ -199,6 +213,20 @@ class TestCacheManager(unittest.TestCase):
         self.assertEqual(stats["misses"], 1)
         self.assertEqual(stats["hit_rate"], 0.5)
         
+    def test_parameterless_cache_key(self):
+        """Test parameterless readbacks are keyed by method name alone"""
+        self.cache.cache_response("get_coordinates", {}, {"ra": 1.0})
+        self.assertIn("get_coordinates", self.cache.response_cache)
+        self.assertEqual(
+            self.cache.get_cached_response("get_coordinates", {}),
+            {"ra": 1.0}
+        )
+        
+        # Parameters give a distinct entry
+        self.assertIsNone(
+            self.cache.get_cached_response("get_coordinates", {"epoch": "J2000"})
+        )
+        
     def test_static_cache(self):
         """Test static resource caching"""
         key = "test_resource"
@@ -256,6 +284,32 @@ class TestPerformanceOptimizer(unittest.TestCase):
         # Stop optimizer
         self.optimizer.stop()
         
+    def test_duplicate_requests_coalesced(self):
+        """Test identical pending readbacks share one API call"""
+        self.mock_api.send_command.return_value = {"ra": 1.0}
+        results = []
+        
+        # Both requests are queued before the batcher runs
+        self.optimizer.send_request("get_coordinates", {}, results.append)
+        self.optimizer.send_request("get_coordinates", {}, results.append)
+        self.assertEqual(len(self.optimizer.request_batcher.batch_queue), 1)
+        
+        self.optimizer.start()
+        time.sleep(0.3)
+        self.optimizer.stop()
+        
+        self.mock_api.send_command.assert_called_once()
+        self.assertEqual(results, [{"ra": 1.0}, {"ra": 1.0}])
+        self.assertEqual(self.optimizer._inflight, {})
+        
+    def test_duplicate_commands_not_coalesced(self):
+        """Test identical commands are each sent"""
+        self.optimizer.send_request("start_exposure", {"duration": 10})
+        self.optimizer.send_request("start_exposure", {"duration": 10})
+        
+        self.assertEqual(len(self.optimizer.request_batcher.batch_queue), 2)
+        self.assertEqual(self.optimizer._inflight, {})
+        
     def test_performance_stats(self):
         """Test performance statistics"""
         # Get initial stats
@@ -270,6 +324,17 @@ class TestPerformanceOptimizer(unittest.TestCase):
         cache_stats = stats["cache_stats"]
         self.assertEqual(cache_stats["hits"], 0)
         self.assertEqual(cache_stats["misses"], 0)
+        
+    def test_request_counters(self):
+        """Test per-method request counters are bound once"""
+        # Known methods are bound up front
+        self.assertIn("get_coordinates", self.optimizer._request_counters)
+        
+        # Unknown methods are bound on first use and reused after
+        self.optimizer.send_request("custom_method", {})
+        counter = self.optimizer._request_counters["custom_method"]
+        self.optimizer.send_request("custom_method", {})
+        self.assertIs(self.optimizer._request_counters["custom_method"], counter)
 
 if __name__ == '__main__':
     unittest.main()
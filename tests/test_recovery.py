@@ -101,11 +101,24 @@ class TestCommandQueue(unittest.TestCase):
         command = Command("test_method", {}, time.time())
         self.queue.add_command(command, priority=1)
         
-        self.assertEqual(self.queue.queue.qsize(), 1)
-        priority, queued_command = self.queue.queue.get()
+        self.assertEqual(self.queue.pending(), 1)
+        priority, queued_command = self.queue._next_command()
         self.assertEqual(priority, 1)
         self.assertEqual(queued_command.method, command.method)
         
+    def test_command_order(self):
+        """Test commands run by priority, then in the order added"""
+        first = Command("first", {}, time.time())
+        second = Command("second", {}, time.time())
+        urgent = Command("urgent", {}, time.time())
+        self.queue.add_command(first, priority=2)
+        self.queue.add_command(second, priority=2)
+        self.queue.add_command(urgent, priority=0)
+        
+        order = [self.queue._next_command()[1].method for _ in range(3)]
+        self.assertEqual(order, ["urgent", "first", "second"])
+        self.assertIsNone(self.queue._next_command())
+        
     def test_command_processing(self):
         """Test command processing"""
         # Setup success callback
@@ -135,6 +148,41 @@ class TestCommandQueue(unittest.TestCase):
         # Stop queue
         self.queue.stop()
         
+    def test_command_batching(self):
+        """Test drained commands of one priority run in the order added"""
+        results = []
+        for i in range(3):
+            self.queue.add_command(
+                Command(f"method{i}", {}, time.time(), callback=results.append),
+                priority=2
+            )
+        self.mock_api.send_command.side_effect = lambda method, params: {"method": method}
+        
+        self.queue.start()
+        time.sleep(0.2)
+        self.queue.stop()
+        
+        self.mock_api.send_batch.assert_not_called()
+        self.assertEqual(
+            [r["method"] for r in results],
+            ["method0", "method1", "method2"]
+        )
+        
+    def test_restart_runs_one_processor(self):
+        """Test a stop and restart leaves a single processor running"""
+        self.queue.start()
+        self.queue.stop()
+        self.queue.start()
+        time.sleep(0.1)
+        
+        processors = [
+            thread for thread in threading.enumerate()
+            if thread.name == "CommandProcessor"
+        ]
+        self.assertEqual(len(processors), 1)
+        
+        self.queue.stop()
+        
     def test_command_retry(self):
         """Test command retry on failure"""
         command = Command(